@@ -1,282 +1,387 @@
 #!/home/moltbot/clawd/skills/radicale/scripts/Radicalized/.venv/bin/python
 import argparse
+import functools
 import sys
-from datetime import datetime
-
-from dotenv import load_dotenv
-
-from managers.manager import Manager
-from utils import (
-    find_caldav_item_by_title,
-    find_contact_url_by_name,
-    extract_display_name,
-    get_manager,
-    get_env,
-    format_contact_extra,
-)
 
 
-def build_parser():
+KINDS = ("event", "task", "journal", "contact")
+ACTIONS = ("list", "get", "add", "update", "delete")
+
+_DT_HELP = "YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
+_STATUS_HELP = "NEEDS-ACTION | IN-PROCESS | COMPLETED | CANCELLED"
+_INVITE = (
+    None,
+    "--invite",
+    dict(nargs="+", help="One or more attendee emails to invite via Google Calendar API"),
+)
+
+# Options of every (kind, action), as (argument group, flag, add_argument kwargs).
+# Both the argparse tree and fast_dispatch() are driven from this table.
+OPTIONS = {
+    ("event", "add"): (
+        (None, "--title", dict(required=True)),
+        (None, "--start", dict(required=True, help="YYYY-MM-DD HH:MM")),
+        (None, "--end", dict(required=True, help="YYYY-MM-DD HH:MM")),
+        _INVITE,
+    ),
+    ("event", "update"): (
+        (None, "--new-title", {}),
+        (None, "--new-desc", {}),
+        _INVITE,
+    ),
+    ("task", "add"): (
+        (None, "--title", dict(required=True)),
+        (None, "--priority", dict(type=int, default=5)),
+        (None, "--desc", {}),
+        (None, "--due", dict(help=_DT_HELP)),
+        (None, "--start", dict(help=_DT_HELP)),
+        (None, "--status", dict(help=_STATUS_HELP)),
+        (None, "--percent-complete", dict(type=int, dest="percent_complete")),
+        (None, "--categories", dict(nargs="+", help="One or more category strings")),
+        (None, "--location", {}),
+        (None, "--url", {}),
+    ),
+    ("task", "update"): (
+        (None, "--new-title", {}),
+        (None, "--new-desc", {}),
+        (None, "--new-priority", dict(type=int, dest="new_priority")),
+        (None, "--new-due", dict(dest="new_due", help=_DT_HELP)),
+        (None, "--new-start", dict(dest="new_start", help=_DT_HELP)),
+        (None, "--new-status", dict(dest="new_status", help=_STATUS_HELP)),
+        (None, "--new-percent-complete", dict(type=int, dest="new_percent_complete")),
+        (None, "--new-categories", dict(nargs="+", dest="new_categories")),
+        (None, "--new-location", dict(dest="new_location")),
+        (None, "--new-url", dict(dest="new_url")),
+    ),
+    ("journal", "add"): (
+        (None, "--title", dict(required=True)),
+        (None, "--desc", dict(default="")),
+    ),
+    ("journal", "update"): (
+        (None, "--new-title", {}),
+        (None, "--new-desc", {}),
+    ),
+    ("contact", "add"): (
+        (None, "--name", dict(required=True)),
+        (None, "--email", {}),
+        (None, "--phone", {}),
+        (None, "--address", {}),
+        (None, "--org", dict(help="Organization or company name (vCard ORG)")),
+        ("Social networks", "--website", {}),
+        ("Social networks", "--instagram", dict(help="@handle or URL")),
+        ("Social networks", "--linkedin", dict(help="URL")),
+        ("Social networks", "--github", dict(help="handle or URL")),
+        ("Other", "--birthday", dict(help="YYYY-MM-DD")),
+        ("Other", "--note", dict(help="Any note")),
+    ),
+    ("contact", "update"): (
+        ("Identity", "--new-name", {}),
+        ("Identity", "--new-org", {}),
+        ("Contact", "--new-email", {}),
+        ("Contact", "--new-phone", {}),
+        ("Contact", "--new-address", {}),
+        ("Social networks", "--new-website", {}),
+        ("Social networks", "--new-instagram", {}),
+        ("Social networks", "--new-linkedin", {}),
+        ("Social networks", "--new-github", {}),
+        ("Other", "--new-birthday", dict(help="YYYY-MM-DD")),
+        ("Other", "--new-note", {}),
+    ),
+}
+
+# get/update/delete are UID-based.
+_UID = (None, "--uid", dict(required=True))
+
+
+def _action_options(kind, action):
+    options = OPTIONS.get((kind, action), ())
+    if action in ("get", "update", "delete"):
+        return (_UID,) + options
+    return options
+
+
+def _dest(flag, opts):
+    return opts.get("dest") or flag[2:].replace("-", "_")
+
+
+def _populate(kind, kind_parser, selected_action=None):
+    """
+    Register every action of `kind`, but only define the options of `selected_action`:
+    the others stay bare, which is all their listing in `<kind> -h` needs.
+    """
+    actions = kind_parser.add_subparsers(dest="action", required=False)
+    for action in ACTIONS:
+        action_parser = actions.add_parser(action)
+        if action != selected_action:
+            continue
+        groups = {}
+        for group, flag, opts in _action_options(kind, action):
+            target = action_parser
+            if group is not None:
+                if group not in groups:
+                    groups[group] = action_parser.add_argument_group(group)
+                target = groups[group]
+            target.add_argument(flag, **opts)
+
+
+def build_parser(argv=None):
+    """
+    Build the CLI parser.
+
+    Only the kind named in argv[1] gets its action sub-tree, and only the action named
+    in argv[2] gets its options; everything else is registered bare so that help and
+    "invalid choice" errors still list it.
+    Parsers are cached per (kind, action), so repeated main() calls reuse the same tree.
+    """
+    if argv is None:
+        argv = sys.argv
+    kind = argv[1] if len(argv) > 1 and argv[1] in KINDS else None
+    action = argv[2] if kind and len(argv) > 2 and argv[2] in ACTIONS else None
+    return _build_parser(kind, action)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser(selected_kind, selected_action=None):
     parser = argparse.ArgumentParser(
         description="Radicale CLI (CalDAV + CardDAV)",
     )
 
     top = parser.add_subparsers(dest="kind", required=True)
 
-    for kind in ["event", "task", "journal", "contact"]:
+    for kind in KINDS:
         kind_parser = top.add_parser(kind)
         kind_parser.set_defaults(_kind_parser=kind_parser)
-        actions = kind_parser.add_subparsers(dest="action", required=False)
-
-        # LIST
-        actions.add_parser("list")
-
-        # GET (UID-based)
-        get_cmd = actions.add_parser("get")
-        get_cmd.add_argument("--uid", required=True)
-
-        # ADD
-        add = actions.add_parser("add")
-
-        if kind == "event":
-            add.add_argument("--title", required=True)
-            add.add_argument("--start", required=True, help="YYYY-MM-DD HH:MM")
-            add.add_argument("--end", required=True, help="YYYY-MM-DD HH:MM")
-            add.add_argument(
-                "--invite",
-                nargs="+",
-                help="One or more attendee emails to invite via Google Calendar API",
-            )
-
-        elif kind == "task":
-            add.add_argument("--title", required=True)
-            add.add_argument("--priority", type=int, default=5)
-            add.add_argument("--desc")
-            add.add_argument("--due", help="YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS")
-            add.add_argument("--start", help="YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS")
-            add.add_argument(
-                "--status", help="NEEDS-ACTION | IN-PROCESS | COMPLETED | CANCELLED"
-            )
-            add.add_argument("--percent-complete", type=int, dest="percent_complete")
-            add.add_argument("--categories", nargs="+", help="One or more category strings")
-            add.add_argument("--location")
-            add.add_argument("--url")
-
-        elif kind == "journal":
-            add.add_argument("--title", required=True)
-            add.add_argument("--desc", default="")
-
-        elif kind == "contact":
-            add.add_argument("--name", required=True)
-            add.add_argument("--email")
-            add.add_argument("--phone")
-            add.add_argument("--address")
-            add.add_argument("--org", help="Organization or company name (vCard ORG)")
-
-            g_social = add.add_argument_group("Social networks")
-            g_social.add_argument("--website")
-            g_social.add_argument("--instagram", help="@handle or URL")
-            g_social.add_argument("--linkedin", help="URL")
-            g_social.add_argument("--github", help="handle or URL")
-
-            g_misc = add.add_argument_group("Other")
-            g_misc.add_argument("--birthday", help="YYYY-MM-DD")
-            g_misc.add_argument("--note", help="Any note")
-
-        # UPDATE (UID-based)
-        update = actions.add_parser("update")
-        update.add_argument("--uid", required=True)
-
-        if kind == "event":
-            update.add_argument("--new-title")
-            update.add_argument("--new-desc")
-            update.add_argument(
-                "--invite",
-                nargs="+",
-                help="One or more attendee emails to invite via Google Calendar API",
-            )
-        elif kind == "contact":
-            g_id = update.add_argument_group("Identity")
-            g_id.add_argument("--new-name")
-            g_id.add_argument("--new-org")
-
-            g_contact = update.add_argument_group("Contact")
-            g_contact.add_argument("--new-email")
-            g_contact.add_argument("--new-phone")
-            g_contact.add_argument("--new-address")
-
-            g_social = update.add_argument_group("Social networks")
-            g_social.add_argument("--new-website")
-            g_social.add_argument("--new-instagram")
-            g_social.add_argument("--new-linkedin")
-            g_social.add_argument("--new-github")
-
-            g_misc = update.add_argument_group("Other")
-            g_misc.add_argument("--new-birthday", help="YYYY-MM-DD")
-            g_misc.add_argument("--new-note")
-        elif kind == "task":
-            update.add_argument("--new-title")
-            update.add_argument("--new-desc")
-            update.add_argument("--new-priority", type=int, dest="new_priority")
-            update.add_argument("--new-due", dest="new_due", help="YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS")
-            update.add_argument("--new-start", dest="new_start", help="YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS")
-            update.add_argument("--new-status", dest="new_status",
-                                help="NEEDS-ACTION | IN-PROCESS | COMPLETED | CANCELLED")
-            update.add_argument("--new-percent-complete", type=int, dest="new_percent_complete")
-            update.add_argument("--new-categories", nargs="+", dest="new_categories")
-            update.add_argument("--new-location", dest="new_location")
-            update.add_argument("--new-url", dest="new_url")
-        else:
-            update.add_argument("--new-title")
-            update.add_argument("--new-desc")
-
-        # DELETE (UID-based)
-        delete = actions.add_parser("delete")
-        delete.add_argument("--uid", required=True)
+        if kind == selected_kind:
+            _populate(kind, kind_parser, selected_action)
 
     return parser
 
-def main():
-    user = get_env("RADICALE_USER")
-    password = get_env("RADICALE_PASS")
 
-    parser = build_parser()
-    args = parser.parse_args()
+def fast_dispatch(argv):
+    """
+    Parse the well-formed `<kind> <action> [--option value ...]` form without argparse.
+
+    Anything it doesn't fully understand (help flags, unknown or abbreviated options,
+    `--opt=value`, missing required options, bad ints...) raises ValueError, so the
+    caller can fall back to build_parser() and get argparse's help and error messages.
+    """
+    if len(argv) < 3 or argv[1] not in KINDS or argv[2] not in ACTIONS:
+        raise ValueError("not a <kind> <action> invocation")
+    kind, action = argv[1], argv[2]
+
+    specs = {}
+    values = {}
+    for _, flag, opts in _action_options(kind, action):
+        specs[flag] = opts
+        values[_dest(flag, opts)] = opts.get("default")
+
+    rest = argv[3:]
+    seen = set()
+    i = 0
+    while i < len(rest):
+        flag = rest[i]
+        opts = specs.get(flag)
+        if opts is None:
+            raise ValueError(f"unknown option {flag!r}")
+        i += 1
+
+        end = i
+        if opts.get("nargs") == "+":
+            while end < len(rest) and not rest[end].startswith("-"):
+                end += 1
+        elif i < len(rest) and not rest[i].startswith("-"):
+            end = i + 1
+        if end == i:
+            raise ValueError(f"missing value for {flag!r}")
+
+        convert = opts.get("type", str)
+        converted = [convert(raw) for raw in rest[i:end]]
+        values[_dest(flag, opts)] = converted if opts.get("nargs") == "+" else converted[0]
+        seen.add(flag)
+        i = end
+
+    for flag, opts in specs.items():
+        if opts.get("required") and flag not in seen:
+            raise ValueError(f"missing required option {flag!r}")
+
+    return argparse.Namespace(kind=kind, action=action, **values)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_parse(argv):
+    """
+    Parse `argv` (without the program name), through fast_dispatch() when possible.
+    Memoized so wrappers that call main() repeatedly with the same command don't re-parse.
+    """
+    full_argv = [sys.argv[0], *argv]
+    try:
+        return fast_dispatch(full_argv)
+    except ValueError:
+        return build_parser(full_argv).parse_args(argv)
+
+
+# ----------------------------
+# Action handlers: (mgr, args) -> None
+# ----------------------------
+def _option_dests(kind, action):
+    return tuple(_dest(flag, opts) for _, flag, opts in OPTIONS[(kind, action)])
+
+
+# ContactManager.add/update take exactly the CLI option names as keywords.
+_CONTACT_ADD_FIELDS = _option_dests("contact", "add")
+_CONTACT_UPDATE_FIELDS = _option_dests("contact", "update")
+
+
+def _list(mgr, args):
+    # summary() already joins all rows; emit them in a single write.
+    sys.stdout.write(mgr.summary() + "\n")
+
+
+def _get_or_exit(mgr, uid):
+    item = mgr.get(uid)
+    if not item:
+        print("Not found")
+        sys.exit(1)
+    return item
+
+
+def _get(mgr, args):
+    item = _get_or_exit(mgr, args.uid)
+    print(mgr.display(item))
+
+
+def _delete(mgr, args):
+    item = _get_or_exit(mgr, args.uid)
+    mgr.delete(item)
+    print("Success")
+
+
+def _add_event(mgr, args):
+    from utils import parse_ymd_hm
+
+    s = parse_ymd_hm(args.start)
+    e = parse_ymd_hm(args.end)
+    created = mgr.add(args.title, s, e)
+    if args.invite:
+        mgr.invite(created, args.invite)
+    print("Success")
+
+
+def _add_task(mgr, args):
+    mgr.add(
+        args.title,
+        priority=args.priority,
+        description=args.desc,
+        due=args.due,
+        start=args.start,
+        status=args.status,
+        percent_complete=args.percent_complete,
+        categories=args.categories,
+        location=args.location,
+        url=args.url,
+    )
+    print("Success")
+
+
+def _add_journal(mgr, args):
+    mgr.add(args.title, desc=args.desc)
+    print("Success")
+
+
+def _add_contact(mgr, args):
+    fields = vars(args)
+    mgr.add(**{k: fields[k] for k in _CONTACT_ADD_FIELDS})
+    print("Success")
+
+
+def _update_event(mgr, args):
+    item = _get_or_exit(mgr, args.uid)
+    mgr.update(
+        item,
+        new_title=args.new_title,
+        new_desc=args.new_desc,
+    )
+    if args.invite:
+        mgr.invite(item, args.invite)
+    print("Success")
+
+
+def _update_task(mgr, args):
+    item = _get_or_exit(mgr, args.uid)
+    mgr.update(
+        item,
+        new_title=args.new_title,
+        new_description=args.new_desc,
+        new_priority=args.new_priority,
+        new_due=args.new_due,
+        new_start=args.new_start,
+        new_status=args.new_status,
+        new_percent_complete=args.new_percent_complete,
+        new_categories=args.new_categories,
+        new_location=args.new_location,
+        new_url=args.new_url,
+    )
+    print("Success")
+
+
+def _update_journal(mgr, args):
+    item = _get_or_exit(mgr, args.uid)
+    mgr.update(
+        item,
+        new_title=args.new_title,
+        new_desc=args.new_desc,
+    )
+    print("Success")
+
+
+def _update_contact(mgr, args):
+    item = _get_or_exit(mgr, args.uid)
+    fields = vars(args)
+    mgr.update(item, **{k: fields[k] for k in _CONTACT_UPDATE_FIELDS})
+    print("Success")
+
+
+DISPATCH = {
+    **{(kind, "list"): _list for kind in KINDS},
+    **{(kind, "get"): _get for kind in KINDS},
+    **{(kind, "delete"): _delete for kind in KINDS},
+    ("event", "add"): _add_event,
+    ("task", "add"): _add_task,
+    ("journal", "add"): _add_journal,
+    ("contact", "add"): _add_contact,
+    ("event", "update"): _update_event,
+    ("task", "update"): _update_task,
+    ("journal", "update"): _update_journal,
+    ("contact", "update"): _update_contact,
+}
+
+
+def main():
+    args = _cached_parse(tuple(sys.argv[1:]))
 
     if not args.action:
         args._kind_parser.print_help()
         sys.exit(0)
 
-    cal_url = get_env("RADICALE_CAL")
-    addr_url = get_env("RADICALE_ADDR")
-    mgr = get_manager(
-        args.kind, cal_url=cal_url, addr_url=addr_url, user=user, password=password
-    )
+    # utils pulls in caldav, vobject and the Google client: only import it once
+    # the arguments are known to be valid and there is work to do.
+    from utils import fast_load_dotenv, get_envs, get_manager
 
-    try:
-        # ---------------- LIST ----------------
-        if args.action == "list":
-            print(mgr.summary())
-
-        # ---------------- ADD ----------------
-        elif args.action == "add":
-            if args.kind == "event":
-                s = datetime.strptime(args.start, "%Y-%m-%d %H:%M")
-                e = datetime.strptime(args.end, "%Y-%m-%d %H:%M")
-                created = mgr.add(args.title, s, e)
-                if args.invite:
-                    mgr.invite(created, args.invite)
-
-            elif args.kind == "task":
-                mgr.add(
-                    args.title,
-                    priority=args.priority,
-                    description=args.desc,
-                    due=args.due,
-                    start=args.start,
-                    status=args.status,
-                    percent_complete=args.percent_complete,
-                    categories=args.categories,
-                    location=args.location,
-                    url=args.url,
-                )
-
-            elif args.kind == "journal":
-                mgr.add(args.title, desc=args.desc)
-
-            elif args.kind == "contact":
-                mgr.add(
-                    name=args.name,
-                    email=args.email,
-                    phone=args.phone,
-                    address=args.address,
-                    org=args.org,
-                    birthday=args.birthday,
-                    note=args.note,
-                    website=args.website,
-                    instagram=args.instagram,
-                    linkedin=args.linkedin,
-                    github=args.github,
-                )
-
-            print("Success")
-
-        # ---------------- UPDATE ----------------
-        elif args.action == "update":
-            item = mgr.get(args.uid)
-            if not item:
-                print("Not found")
-                sys.exit(1)
-
-            if args.kind == "contact":
-                mgr.update(
-                    item,
-                    new_name=args.new_name,
-                    new_email=args.new_email,
-                    new_phone=args.new_phone,
-                    new_address=args.new_address,
-                    new_org=args.new_org,
-                    new_birthday=args.new_birthday,
-                    new_note=args.new_note,
-                    new_website=args.new_website,
-                    new_instagram=args.new_instagram,
-                    new_linkedin=args.new_linkedin,
-                    new_github=args.new_github,
-                )
-
-            elif args.kind == "task":
-                mgr.update(
-                    item,
-                    new_title=args.new_title,
-                    new_description=args.new_desc,
-                    new_priority=args.new_priority,
-                    new_due=args.new_due,
-                    new_start=args.new_start,
-                    new_status=args.new_status,
-                    new_percent_complete=args.new_percent_complete,
-                    new_categories=args.new_categories,
-                    new_location=args.new_location,
-                    new_url=args.new_url,
-                )
-
-            else:
-                mgr.update(
-                    item,
-                    new_title=args.new_title,
-                    new_desc=args.new_desc,
-                )
-
-                if args.kind == "event" and args.invite:
-                    mgr.invite(item, args.invite)
-
-            print("Success")
-
-        # ---------------- DELETE ----------------
-        elif args.action == "delete":
-            item = mgr.get(args.uid)
-            if not item:
-                print("Not found")
-                sys.exit(1)
-
-            mgr.delete(item)
-            print("Success")
-
-        # ---------------- GET ----------------
-        elif args.action == "get":
-            item = mgr.get(args.uid)
-            if not item:
-                print("Not found")
-                sys.exit(1)
-            print(mgr.display(item))
+    fast_load_dotenv()
+    # Only the collection URL this kind works on is required.
+    if args.kind == "contact":
+        url_kw, url_env = "addr_url", "RADICALE_ADDR"
+    else:
+        url_kw, url_env = "cal_url", "RADICALE_CAL"
+    user, password, url = get_envs("RADICALE_USER", "RADICALE_PASS", url_env)
+    mgr = get_manager(args.kind, user=user, password=password, **{url_kw: url})
 
+    try:
+        DISPATCH[(args.kind, args.action)](mgr, args)
     except Exception as e:
         print(f"Operation failed: {e}")
-        raise e
-        sys.exit(1)
-
-
+        raise
 
 
 if __name__ == "__main__":
-    load_dotenv()
     main()
@@ -1,36 +1,125 @@
+import functools
 import os
-from datetime import datetime, time, timedelta
-from typing import Sequence, Union
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta, timezone
+from typing import Iterable, Iterator, Sequence, Union
+from urllib.parse import urljoin
+from xml.etree import ElementTree as ET
 
 import caldav
+import vobject
 from caldav import CalendarObjectResource
+from vobject.base import ContentLine
 
 from managers.manager import Manager
-from managers.utils import invite_attendees_by_icaluid, sync_caldav_google
+from managers.utils import (
+    event_lookup_request,
+    fmt_dt,
+    normalize_emails,
+    patch_attendees_request,
+    single_event,
+    sync_caldav_google,
+)
+
+CALDAV_NS = "urn:ietf:params:xml:ns:caldav"
+
+# VEVENT properties summary() displays; everything else (VALARMs, X-props...) is not fetched.
+SUMMARY_PROPS = ("UID", "SUMMARY", "DESCRIPTION", "DTSTART", "DTEND", "ATTENDEE")
+
+# Minimal params for invited ATTENDEE lines, to make them sane for most clients
+_ATTENDEE_PARAMS = (
+    ("CUTYPE", "INDIVIDUAL"),
+    ("ROLE", "REQ-PARTICIPANT"),
+    ("PARTSTAT", "NEEDS-ACTION"),
+    ("RSVP", "TRUE"),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_ics(data: str):
+    """
+    Parse a raw ICS payload once per distinct payload.
+    The component is shared between callers: treat it as read-only.
+    """
+    return vobject.readOne(data)
+
+
+def _vevents(items: Iterable[CalendarObjectResource]) -> Iterator:
+    """
+    Read-only VEVENTs of `items` (non-events yield nothing; a server-expanded
+    recurring event yields one VEVENT per occurrence).
+    """
+    for item in items:
+        yield from _parse_ics(item.data).contents.get("vevent", ())
+
+
+def _utc_stamp(dt: datetime) -> str:
+    # Naive datetimes are local time, like everywhere else in the CLI
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _sync_best_effort():
+    try:
+        sync_caldav_google()
+    except Exception:
+        print("Sync between CalDAV and Google Calendar failed, ignoring")
 
 
 class CalendarManager(Manager[CalendarObjectResource]):
+    # Whether calendar.search() accepts uid=...; flipped off on the first TypeError.
+    _search_supports_uid = True
+
     def __init__(
         self,
         url: str,
         username: str,
         password: str,
         *,
-        google_service,
+        google_service=None,
+        google_service_factory=None,
         google_calendar_id_env: str = "GOOGLE_CALENDAR_ID",
     ):
+        """
+        Pass either a built `google_service`, or a `google_service_factory` called the
+        first time a Google call needs one (listing events never does).
+        """
         super().__init__(url, username, password)
-        self.calendar = self.client.calendar(url=url)
-
-        self.google_service = google_service
-        self.google_calendar_id = os.environ[google_calendar_id_env]
-
-    def list(
-            self,
-            start_date: datetime | None = None,
-            end_date: datetime | None = None,
-    ) -> list[CalendarObjectResource]:
+        if google_service is not None:
+            self.google_service = google_service
+        self._google_service_factory = google_service_factory
+        self._google_calendar_id_env = google_calendar_id_env
+
+    @functools.cached_property
+    def google_service(self):
+        if self._google_service_factory is None:
+            raise ValueError("No Google Calendar service configured.")
+        return self._google_service_factory()
+
+    @functools.cached_property
+    def google_calendar_id(self) -> str:
+        # Only read once a Google call actually needs it
+        return os.environ[self._google_calendar_id_env]
+
+    @functools.cached_property
+    def _primary_email(self) -> str | None:
+        """
+        Email of the Google account (its primary calendar id), resolved once per manager.
+        invite() may also fill it in from its batched lookup.
+        """
+        try:
+            a = (
+                self.google_service.calendarList()
+                .get(calendarId="primary", fields="id")
+                .execute()
+            )
+        except Exception:
+            return None
+        return a.get("id")
 
+    @staticmethod
+    def _window(
+            start_date: datetime | None, end_date: datetime | None
+    ) -> tuple[datetime, datetime]:
         # Default start_date = today at 00:00 (local time)
         if start_date is None:
             today = datetime.now().date()
@@ -39,6 +128,15 @@ class CalendarManager(Manager[CalendarObjectResource]):
         if end_date is None:
             end_date = start_date + timedelta(days=30)
 
+        return start_date, end_date
+
+    def list(
+            self,
+            start_date: datetime | None = None,
+            end_date: datetime | None = None,
+    ) -> list[CalendarObjectResource]:
+        start_date, end_date = self._window(start_date, end_date)
+
         return self.calendar.search(
             start=start_date,
             end=end_date,
@@ -46,6 +144,63 @@ class CalendarManager(Manager[CalendarObjectResource]):
             expand=True,
         )
 
+    def iter(
+            self,
+            start_date: datetime | None = None,
+            end_date: datetime | None = None,
+            props: Sequence[str] | None = None,
+    ) -> Iterator[CalendarObjectResource]:
+        """
+        Same window as list(), but streams the calendar-query REPORT and yields each
+        event as soon as its <d:response> is parsed, instead of materializing them all.
+        Recurrences are expanded by the server: one object may hold several VEVENTs.
+
+        `props` restricts the returned VEVENTs to those properties (partial
+        calendar-data); servers that don't support it just send everything.
+        """
+        start_date, end_date = self._window(start_date, end_date)
+        span = f'start="{_utc_stamp(start_date)}" end="{_utc_stamp(end_date)}"'
+        comps = ""
+        if props is not None:
+            wanted = "".join(f'<c:prop name="{p.upper()}"/>' for p in props)
+            comps = f'<c:comp name="VCALENDAR"><c:comp name="VEVENT">{wanted}</c:comp></c:comp>'
+        body = f"""<?xml version="1.0" encoding="utf-8" ?>
+<c:calendar-query xmlns:d="DAV:" xmlns:c="{CALDAV_NS}">
+  <d:prop><d:getetag/><c:calendar-data>{comps}<c:expand {span}/></c:calendar-data></d:prop>
+  <c:filter>
+    <c:comp-filter name="VCALENDAR">
+      <c:comp-filter name="VEVENT"><c:time-range {span}/></c:comp-filter>
+    </c:comp-filter>
+  </c:filter>
+</c:calendar-query>
+"""
+        # Through the client's pooled, retrying session rather than a one-off connection
+        with self.client.session.request(
+            "REPORT",
+            self.base,
+            auth=self.auth,
+            timeout=20,
+            headers={"Depth": "1", "Content-Type": "application/xml"},
+            data=body.encode("utf-8"),
+            stream=True,
+        ) as r:
+            r.raise_for_status()
+            # niquests hands out the raw stream still gzip-encoded
+            r.raw.decode_content = True
+            for _, el in ET.iterparse(r.raw):
+                if el.tag != "{DAV:}response":
+                    continue
+                href = el.findtext("{DAV:}href")
+                data = el.findtext(f".//{{{CALDAV_NS}}}calendar-data")
+                el.clear()
+                if href and data:
+                    yield CalendarObjectResource(
+                        client=self.client,
+                        url=urljoin(self.base, href),
+                        data=data,
+                        parent=self.calendar,
+                    )
+
     def add(self, title: str, start: datetime, end: datetime):
         return self.calendar.save_event(dtstart=start, dtend=end, summary=title)
 
@@ -85,11 +240,14 @@ class CalendarManager(Manager[CalendarObjectResource]):
 
         Note: the item must have already been synced to Google for this to work.
         """
-        # Best-effort: ensure the event exists in Google before we patch it.
-        try:
-            sync_caldav_google()
-        except Exception:
-            print("Sync between CalDAV and Google Calendar failed, ignoring")
+        # Best-effort: ensure the event exists in Google before we patch it. The sync
+        # runs in the background while the event is looked up, and is waited for
+        # before anything is written: a sync that read the CalDAV event before the new
+        # ATTENDEE lines were saved would push it back to Google without them, and
+        # Google would send "canceled" emails.
+        pool = ThreadPoolExecutor(max_workers=1)
+        sync = pool.submit(_sync_best_effort)
+        pool.shutdown(wait=False)
 
         v = item.vobject_instance
         if not hasattr(v, "vevent"):
@@ -100,82 +258,80 @@ class CalendarManager(Manager[CalendarObjectResource]):
             raise ValueError("VEVENT has no UID; cannot invite by iCalUID.")
 
         # Normalize emails to a de-duped list (case-insensitive), preserving order.
-        if isinstance(emails, str):
-            raw_emails = [emails]
-        else:
-            raw_emails = list(emails)
-
-        norm_emails = []
-        seen = set()
-        for e in raw_emails:
-            e2 = e.strip()
-            if not e2:
-                continue
-            key = e2.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            norm_emails.append(e2)
-
-        if not norm_emails:
-            raise ValueError("No attendee emails provided.")
+        norm_emails = normalize_emails(emails)
 
         ical_uid = ev.uid.value
 
-        # 1) Invite via Google (sends emails)
-        updated = invite_attendees_by_icaluid(
+        # 1) Look up the Google event, and (if we'll need it for ORGANIZER) the primary
+        # calendar id, in a single batched HTTP round-trip.
+        responses = {}
+
+        def _collect(request_id, response, exception):
+            responses[request_id] = (response, exception)
+
+        batch = self.google_service.new_batch_http_request(callback=_collect)
+        batch.add(
+            event_lookup_request(self.google_service, self.google_calendar_id, ical_uid),
+            request_id="event",
+        )
+        if not hasattr(ev, "organizer") and "_primary_email" not in self.__dict__:
+            batch.add(
+                self.google_service.calendarList().get(calendarId="primary", fields="id"),
+                request_id="primary",
+            )
+        batch.execute()
+        sync.result()
+
+        resp, exc = responses["event"]
+        if exc is not None:
+            raise exc
+        if not resp.get("items"):
+            # Not on Google before the sync: look again now that it has run.
+            resp = event_lookup_request(
+                self.google_service, self.google_calendar_id, ical_uid
+            ).execute()
+        event = single_event(resp, ical_uid)
+
+        # 2) Invite via Google (sends emails)
+        updated = patch_attendees_request(
             self.google_service,
-            ical_uid,
+            self.google_calendar_id,
+            event,
             norm_emails,
             send_updates=send_updates,
             keep_existing=keep_existing,
-        )
+        ).execute()
 
-        # 2) Persist attendees into the CalDAV event too, so sync won't "remove" them.
-        existing_attendees = set()
-        if hasattr(ev, "attendee"):
-            att = ev.attendee
-            # vobject: can be a list if multiple ATTENDEE properties exist
-            if isinstance(att, list):
-                for a in att:
-                    if hasattr(a, "value") and a.value:
-                        existing_attendees.add(a.value.strip().lower())
-            else:
-                if hasattr(att, "value") and att.value:
-                    existing_attendees.add(att.value.strip().lower())
+        # 3) Persist attendees into the CalDAV event too, so sync won't "remove" them.
+        # vobject keeps every ATTENDEE line in ev.contents["attendee"]
+        existing_attendees = {
+            a.value.strip().lower()
+            for a in ev.contents.get("attendee", ())
+            if a.value
+        }
 
         # Add missing ATTENDEE lines
-        changed = False
-        for email in norm_emails:
-            mailto = f"mailto:{email}"
-            if mailto.lower() in existing_attendees:
-                continue
-
-            a = ev.add("attendee")
-            a.value = mailto
-            # Minimal params to make it sane for most clients
-            a.params["CUTYPE"] = ["INDIVIDUAL"]
-            a.params["ROLE"] = ["REQ-PARTICIPANT"]
-            a.params["PARTSTAT"] = ["NEEDS-ACTION"]
-            a.params["RSVP"] = ["TRUE"]
-            changed = True
+        to_add = [e for e in norm_emails if f"mailto:{e.lower()}" not in existing_attendees]
+        if to_add:
+            # Built directly and appended in one go rather than through ev.add() per email
+            ev.contents.setdefault("attendee", []).extend(
+                ContentLine("ATTENDEE", _ATTENDEE_PARAMS, f"mailto:{email}")
+                for email in to_add
+            )
+        changed = bool(to_add)
 
         # Ensure ORGANIZER exists (helps some clients; also reduces weirdness)
         # If you don't want this, you can remove this block.
         if not hasattr(ev, "organizer"):
-            try:
-                a = (
-                    self.google_service.calendarList()
-                    .get(calendarId="primary")
-                    .execute()
-                )
-                primary_email = a.get("id")
-                if primary_email:
-                    org = ev.add("organizer")
-                    org.value = f"mailto:{primary_email}"
-            except Exception:
-                # If we can't resolve it, don't block invites.
-                pass
+            primary, exc = responses.get("primary", (None, None))
+            if primary is not None and exc is None:
+                self._primary_email = primary.get("id")
+            # Falls back to a standalone lookup; None if that fails too, which
+            # doesn't block invites.
+            primary_email = self._primary_email
+            if primary_email:
+                org = ev.add("organizer")
+                org.value = f"mailto:{primary_email}"
 
         if changed:
             item.save()
@@ -187,104 +343,59 @@ class CalendarManager(Manager[CalendarObjectResource]):
         Return the string to display the list of events in the calendar between the two dates.
         Each item displays: title, description, date/time, attendees (if any).
         """
-        items = self.list(start_date=start_date, end_date=end_date)
-
-        def _fmt_dt(dt: object) -> str:
-            # vobject can give datetime/date-like objects; try common representations
-            if isinstance(dt, datetime):
-                return dt.strftime("%Y-%m-%d %H:%M")
-            # date (no time)
-            try:
-                return dt.strftime("%Y-%m-%d")  # type: ignore[attr-defined]
-            except Exception:
-                return str(dt)
-
-        lines: list[str] = []
-        for item in items:
-            v = item.vobject_instance
-            if not hasattr(v, "vevent"):
-                # Skip non-VEVENT components
-                continue
-            ev = v.vevent
-
-            uid = ev.uid.value
-            title = ev.summary.value
-            if hasattr(ev, "description"):
-                desc = ev.description.value
-            else:
-                desc = ""
-
-            start = None
-            end = None
-            if hasattr(ev, "dtstart") and hasattr(ev.dtstart, "value"):
-                start = ev.dtstart.value
-            if hasattr(ev, "dtend") and hasattr(ev.dtend, "value"):
-                end = ev.dtend.value
+        items = self.iter(start_date=start_date, end_date=end_date, props=SUMMARY_PROPS)
+
+        blocks: list[str] = []
+        for ev in _vevents(items):
+            # vobject keeps children as {name: [ContentLine, ...]}: read them in one pass
+            c = ev.contents
+            uid = c["uid"][0].value
+            title = c["summary"][0].value
+            desc = c["description"][0].value if "description" in c else ""
+            start = c["dtstart"][0].value if "dtstart" in c else None
+            end = c["dtend"][0].value if "dtend" in c else None
 
             when = ""
             if start is not None and end is not None:
-                when = f"{_fmt_dt(start)} → {_fmt_dt(end)}"
+                when = f"{fmt_dt(start)} → {fmt_dt(end)}"
             elif start is not None:
-                when = f"Starts: {_fmt_dt(start)}"
+                when = f"Starts: {fmt_dt(start)}"
             elif end is not None:
-                when = f"Ends: {_fmt_dt(end)}"
+                when = f"Ends: {fmt_dt(end)}"
             else:
                 when = "(no time)"
 
-            attendees: list[str] = []
-            if hasattr(ev, "attendee"):
-                att = ev.attendee
-                if isinstance(att, list):
-                    props = att
-                else:
-                    props = [att]
-
-                for a in props:
-                    if hasattr(a, "value") and a.value:
-                        attendees.append(str(a.value))
-
-            lines.append(f"- {title}")
-            lines.append(f"  UID: {uid}")
-            lines.append(f"  When: {when}")
+            parts = [f"- {title}\n  UID: {uid}\n  When: {when}\n"]
             if desc:
-                lines.append(f"  Description: {desc}")
+                parts.append(f"  Description: {desc}\n")
+            attendees = [str(a.value) for a in c.get("attendee", ()) if a.value]
             if attendees:
-                lines.append("  Attendees:")
-                for a in attendees:
-                    lines.append(f"    - {a}")
-            lines.append("")  # blank line between events
+                parts.append("  Attendees:\n")
+                parts.extend(f"    - {a}\n" for a in attendees)
+            blocks.append("".join(parts))
 
-        if not lines:
+        if not blocks:
             return "No events."
 
-        # Trim trailing blank line
-        if lines[-1] == "":
-            lines.pop()
-
-        return "\n".join(lines)
+        # One blank line between events, none trailing
+        return "\n".join(blocks)[:-1]
 
     def get(self, uid: str) -> CalendarObjectResource | None:
         """
         Find a single VEVENT by its iCal UID.
         Returns the first match, or None if not found.
         """
-        # CalDAV search can filter by UID in many servers; if not supported,
-        # we fall back to scanning recent items.
+        # CalDAV search can filter by UID server-side; older caldav versions don't
+        # accept uid=... in search(), which we only find out (and remember) once.
+        if CalendarManager._search_supports_uid:
+            try:
+                results = self.calendar.search(uid=uid, event=True)
+                return results[0] if results else None
+            except TypeError:
+                CalendarManager._search_supports_uid = False
+
+        # Fallback: a UID text-match REPORT, rather than scanning list() client-side
         try:
-            results = self.calendar.search(uid=uid, event=True)
-            if results:
-                return results[0]
-        except TypeError:
-            # Some caldav backends don't accept uid=... in search()
-            pass
-
-        # Fallback: scan a reasonable window and match UID client-side
-        for item in self.list():
-            v = item.vobject_instance
-            if not hasattr(v, "vevent"):
-                continue
-            ev = v.vevent
-            if hasattr(ev, "uid") and getattr(ev.uid, "value", None) == uid:
-                return item
-
-        return None
\ No newline at end of file
+            return self.calendar.event_by_uid(uid)
+        except caldav.error.NotFoundError:
+            return None
\ No newline at end of file
@@ -1,14 +1,151 @@
+import functools
+import re
 import uuid
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 from urllib.parse import urljoin, urlparse
 
-import requests
-import vobject
-from xml.etree import ElementTree as ET
+from lxml import etree
+from xml.sax.saxutils import escape
 
 from managers.manager import Manager
 
+_PROPFIND_ETAGS = b"""<?xml version="1.0" encoding="utf-8" ?>
+<d:propfind xmlns:d="DAV:">
+  <d:prop><d:getetag/></d:prop>
+</d:propfind>
+"""
+
+_VCARD_ESCAPE = str.maketrans({"\\": "\\\\", "\n": "\\n", ";": r"\;", ",": r"\,"})
+
+# Profile URL base (no trailing slash) of each X-SOCIALPROFILE type, and whether
+# an "@handle" is accepted for it.
+_SOCIAL_BASES = {
+    "instagram": ("https://instagram.com", True),
+    "linkedin": ("https://linkedin.com/in", False),
+    "github": ("https://github.com", False),
+    "twitter": ("https://twitter.com", True),
+}
+
+# vCard properties a Contact is built from (vobject's lowercase names)
+_CONTACT_PROPS = frozenset(
+    ("uid", "fn", "email", "tel", "org", "title", "bday", "note", "url", "adr")
+)
+# Folded continuation lines start with a space or a tab
+_UNFOLD = re.compile(r"\r?\n[ \t]")
+# A lone CR or LF. vobject already serializes with CRLF, and re.sub returns its input
+# untouched when nothing matches, so normalizing is a single allocation-free scan.
+_BARE_EOL = re.compile(r"\r(?!\n)|(?<!\r)\n")
+
+
+def _parse_vcard_fast(text: str) -> dict[str, object] | None:
+    """
+    First value of each _CONTACT_PROPS property, decoded the way vobject does,
+    without building a component tree.
+    Returns None for cards that need vobject's full parser (quoted or ENCODING parameters).
+    """
+    fields: dict[str, object] = {}
+    for line in _UNFOLD.sub("", text).split("\n"):
+        head, sep, value = line.rstrip("\r").partition(":")
+        if not sep:
+            continue
+        # Drop parameters and any "item1." group prefix
+        name = head.split(";", 1)[0].rsplit(".", 1)[-1].lower()
+        if name not in _CONTACT_PROPS or name in fields:
+            continue
+        if '"' in head or "ENCODING" in head.upper():
+            return None
+
+        # vobject is only imported for the values that need its decoders
+        if name == "org":
+            from vobject.vcard import splitFields
+
+            fields[name] = splitFields(value)
+        elif name == "adr":
+            from vobject.vcard import ADDRESS_ORDER, Address, splitFields
+
+            fields[name] = Address(**dict(zip(ADDRESS_ORDER, splitFields(value))))
+        elif "\\" in value:
+            from vobject.icalendar import stringToTextValues
+
+            fields[name] = stringToTextValues(value)[0]
+        else:
+            # Same as vobject: an unescaped comma ends the first text value
+            fields[name] = value.split(",", 1)[0]
+    return fields
+
+
+# vCard content line: NAME[;PARAMS]:VALUE, where quoted params may contain ":"
+_CONTENT_LINE = re.compile(r'((?:[^:"]|"[^"]*")*):(.*)', re.S)
+# One ";PARAM" of a content line's head, quoted values included
+_PARAM = re.compile(r';((?:[^;"]|"[^"]*")*)')
+# Parameters describing how the old value was encoded (vCard 2.1 also allows the bare
+# encoding names); a rewritten value is plain text, so they are dropped with it.
+_ENCODING_PARAMS = frozenset(("ENCODING", "CHARSET", "QUOTED-PRINTABLE", "BASE64", "8BIT"))
+
+
+def _plain_head(head: str) -> str:
+    """`head` (GROUP.NAME;PARAMS) without the parameters about the value's encoding."""
+    prop, sep, params = head.partition(";")
+    if not sep:
+        return head
+    kept = [
+        param
+        for param in _PARAM.findall(sep + params)
+        if param.split("=", 1)[0].strip().upper() not in _ENCODING_PARAMS
+    ]
+    return ";".join((prop, *kept))
+
+
+def _patch_vcard_text(raw: str, updates: dict[str, str]) -> str:
+    """
+    Give the first property of each NAME in `updates` the new (already escaped) value,
+    keeping its group and parameters except ENCODING/CHARSET; properties the card lacks
+    are added before END:VCARD. Every other line is kept as is.
+    """
+    pending = dict(updates)
+    out: list[str] = []
+    for line in _UNFOLD.sub("", raw).split("\n"):
+        line = line.rstrip("\r")
+        if not line:
+            continue
+        m = _CONTENT_LINE.match(line)
+        if m:
+            head = m.group(1)
+            name = head.split(";", 1)[0].rsplit(".", 1)[-1].upper()
+            if name in pending:
+                out.append(f"{_plain_head(head)}:{pending.pop(name)}")
+                continue
+            if name == "END" and m.group(2).strip().upper() == "VCARD":
+                out.extend(f"{name}:{value}" for name, value in pending.items())
+                pending.clear()
+        out.append(line)
+    return "\r\n".join(out) + "\r\n"
+
+
+def _iter_responses(source):
+    """
+    Yield each <d:response> of a multistatus body (a file-like object) as libxml2
+    parses it, freeing it (and the ones before it) once the caller is done with it.
+
+    A multistatus has no DTD or entities to honour: libxml2 is told not to expand
+    entities, fetch anything over the network or lift its size limits, and to drop
+    the whitespace between elements.
+    """
+    for _, resp in etree.iterparse(
+        source,
+        events=("end",),
+        tag="{DAV:}response",
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=False,
+        remove_blank_text=True,
+    ):
+        yield resp
+        resp.clear()
+        while resp.getprevious() is not None:
+            del resp.getparent()[0]
+
 
 @dataclass(frozen=True)
 class Contact:
@@ -31,10 +168,42 @@ class Contact:
 class ContactManager(Manager[Contact]):
     def __init__(self, addressbook_url: str, username: str, password: str):
         super().__init__(addressbook_url, username, password)
-        self.calendar = self.client.calendar(url=addressbook_url)
+        parsed = urlparse(self.base)
+        self._origin = f"{parsed.scheme}://{parsed.netloc}"
+        self._base_path = parsed.path.rstrip("/") + "/"
+
+        # url -> (etag, Contact) of the cards already downloaded
+        self._cache: dict[str, tuple[str, Contact]] = {}
 
     def _req(self, method: str, url: str, **kwargs):
-        return requests.request(method, url, auth=self.auth, timeout=20, **kwargs)
+        # Every CardDAV request goes through the shared DAVClient's pooled session
+        return self.client.session.request(
+            method, url, auth=self.auth, timeout=20, **kwargs
+        )
+
+    def _multistatus(self, method: str, body: bytes):
+        """
+        Send a Depth: 1 PROPFIND/REPORT to the addressbook and yield its <d:response>
+        elements while the body is still being downloaded.
+        """
+        with self._req(
+            method,
+            self.base,
+            headers={"Depth": "1", "Content-Type": "application/xml"},
+            data=body,
+            stream=True,
+        ) as r:
+            r.raise_for_status()
+            # niquests hands out the raw stream still gzip-encoded
+            r.raw.decode_content = True
+            yield from _iter_responses(r.raw)
+
+    def request(self, url: str, **kwargs):
+        import vobject
+
+        r = self._req("GET", url, **kwargs)
+        r.raise_for_status()
+        return vobject.readOne(r.text)
 
     # ----------------------------
     # Listing
@@ -44,71 +213,148 @@ class ContactManager(Manager[Contact]):
         """
         Cheap listing: returns .vcf URLs without downloading each vCard.
         """
-        body = """<?xml version="1.0" encoding="utf-8" ?>
-<d:propfind xmlns:d="DAV:">
-  <d:prop><d:getetag/></d:prop>
-</d:propfind>
-"""
-        r = self._req(
-            "PROPFIND",
-            self.base,
-            headers={"Depth": "1", "Content-Type": "application/xml"},
-            data=body,
-        )
-        r.raise_for_status()
-
-        root = ET.fromstring(r.text)
-        ns = {"d": "DAV:"}
+        return list(self.list_etags())
 
-        hrefs: list[str] = []
-        base_path = urlparse(self.base).path.rstrip("/") + "/"
+    def list_etags(self) -> dict[str, str | None]:
+        """
+        Same PROPFIND as list_urls(), keeping each .vcf URL's ETag (None if the server has none).
+        """
+        etags: dict[str, str | None] = {}
+        base_path = self._base_path
 
-        for resp in root.findall(".//d:response", ns):
-            href_el = resp.find("d:href", ns)
-            if href_el is None or not href_el.text:
+        for resp in self._multistatus("PROPFIND", _PROPFIND_ETAGS):
+            href_text = resp.findtext("{DAV:}href")
+            if not href_text:
                 continue
 
-            href_text = href_el.text
-            abs_url = urljoin(self.base, href_text)
+            # Servers normally answer with absolute paths: no need to parse them
+            if href_text.startswith("/"):
+                path = href_text
+                abs_url = self._origin + href_text
+            else:
+                abs_url = urljoin(self.base, href_text)
+                path = urlparse(abs_url).path
 
             # Skip the collection itself
-            if urlparse(abs_url).path.rstrip("/") + "/" == base_path:
+            if path.rstrip("/") + "/" == base_path:
                 continue
 
-            if abs_url.lower().endswith(".vcf"):
-                hrefs.append(abs_url)
+            if path[-4:].lower() == ".vcf":
+                etags[abs_url] = resp.findtext(".//{DAV:}getetag")
 
-        return hrefs
+        return etags
 
-    def list(self, limit: int = 200) -> list[Contact]:
+    def list_with_data(self, urls: list[str]) -> list[tuple[str, str | None, Contact]]:
         """
-        Object listing: fetches up to `limit` vCards and returns Contact objects.
+        Fetch the given .vcf URLs in a single addressbook-multiget REPORT.
+        Returns (url, etag, Contact) triples; cards the server can't return or that don't parse are skipped.
         """
-        urls = self.list_urls()[:limit]
-        out: list[Contact] = []
+        if not urls:
+            return []
+
+        hrefs = "".join(f"  <d:href>{escape(urlparse(u).path)}</d:href>\n" for u in urls)
+        body = f"""<?xml version="1.0" encoding="utf-8" ?>
+<c:addressbook-multiget xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:carddav">
+  <d:prop><d:getetag/><c:address-data/></d:prop>
+{hrefs}</c:addressbook-multiget>
+"""
+        return self._address_data(self._multistatus("REPORT", body.encode("utf-8")))
 
-        for url in urls:
+    def list_bulk(self, limit: int | None = None) -> list[Contact]:
+        """
+        Download the vCards of the whole addressbook (or the first `limit`) in a single
+        addressbook-query REPORT, without listing their URLs first.
+        The empty <c:filter/> (required by RFC 6352 8.6) matches every card.
+        """
+        return self._query("<c:filter/>", limit)
+
+    def _query(self, filter_xml: str, limit: int | None) -> list[Contact]:
+        """
+        Contacts matching an addressbook-query <c:filter>, in the server's order.
+        """
+        nresults = f"\n  <c:limit><c:nresults>{limit}</c:nresults></c:limit>" if limit else ""
+        body = f"""<?xml version="1.0" encoding="utf-8" ?>
+<c:addressbook-query xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:carddav">
+  <d:prop><d:getetag/><c:address-data/></d:prop>
+  {filter_xml}{nresults}
+</c:addressbook-query>
+"""
+        # The server may ignore <c:limit>
+        cards = self._address_data(self._multistatus("REPORT", body.encode("utf-8")))[:limit]
+        return [self._cache_contact(url, etag, c) for url, etag, c in cards]
+
+    def _address_data(self, responses) -> list[tuple[str, str | None, Contact]]:
+        """
+        (url, etag, Contact) triples of multistatus responses carrying address-data;
+        unusable cards are skipped.
+        """
+        out: list[tuple[str, str | None, Contact]] = []
+        for resp in responses:
+            href = resp.findtext("{DAV:}href")
+            data = resp.findtext(".//{urn:ietf:params:xml:ns:carddav}address-data")
+            if not href or not data:
+                continue
+            url = urljoin(self.base, href)
             try:
-                v = self.request(url)
+                contact = self._contact_from_text(url, data)
             except Exception:
                 continue
-            out.append(self._contact_from_vobject(url, v))
+            out.append((url, resp.findtext(".//{DAV:}getetag"), contact))
 
         return out
 
+    def _cache_contact(self, url: str, etag: str | None, contact: Contact) -> Contact:
+        if etag:
+            self._cache[url] = (etag, contact)
+        return contact
+
+    def list(self, limit: int = 200) -> list[Contact]:
+        """
+        Object listing: fetches up to `limit` vCards and returns Contact objects.
+
+        Once this manager has seen the addressbook, only cards whose ETag changed
+        since are downloaded again.
+        """
+        if not self._cache:
+            return self.list_bulk(limit)
+        return self._list_from_etags(self.list_etags(), limit)
+
+    def list_with_total(self, limit: int = 200) -> tuple[List[Contact], int]:
+        """
+        list(), plus the number of cards in the whole addressbook, from the same PROPFIND.
+        """
+        etags = self.list_etags()
+        return self._list_from_etags(etags, limit), len(etags)
+
+    def _list_from_etags(self, etags: dict[str, str | None], limit: int) -> List[Contact]:
+        # Serve unchanged cards from the cache, multiget the others
+        for url in self._cache.keys() - etags.keys():
+            del self._cache[url]
+
+        urls = list(etags)[:limit]
+        stale = {
+            url
+            for url in urls
+            if etags[url] is None or url not in self._cache or self._cache[url][0] != etags[url]
+        }
+        fresh = {
+            url: self._cache_contact(url, etag, c)
+            for url, etag, c in self.list_with_data([u for u in urls if u in stale])
+        }
+
+        return [
+            fresh[url] if url in fresh else self._cache[url][1]
+            for url in urls
+            if url in fresh or url not in stale
+        ]
+
     # ----------------------------
     # vCard building / parsing
     # ----------------------------
 
     def _vcard_escape(self, s: str) -> str:
-        # vCard text escaping: \, ;, , and newlines
-        return (
-            str(s)
-            .replace("\\", "\\\\")
-            .replace("\n", "\\n")
-            .replace(";", r"\;")
-            .replace(",", r"\,")
-        )
+        # vCard text escaping: \, ;, , and newlines, in a single pass
+        return (s if isinstance(s, str) else str(s)).translate(_VCARD_ESCAPE)
 
     def _build_vcard_text(
         self,
@@ -134,84 +380,79 @@ class ContactManager(Manager[Contact]):
         given = parts[0] if parts else ""
         family = parts[-1] if len(parts) > 1 else ""
 
+        esc = self._vcard_escape
+        # (line template, value): the line is only emitted for a non-empty value
+        optional = (
+            ("ORG:{}", org),
+            ("TITLE:{}", title),
+            ("EMAIL;TYPE=INTERNET:{}", email),
+            ("TEL;TYPE=CELL:{}", phone),
+            ("ADR;TYPE=HOME:;;{};;;;", address),
+            # vCard 3.0: BDAY:YYYY-MM-DD (généralement accepté)
+            ("BDAY:{}", birthday),
+            ("NOTE:{}", note),
+            # Liens / réseaux
+            ("URL:{}", website),
+        )
+        socials = (("instagram", instagram), ("linkedin", linkedin), ("github", github))
+
         lines = [
             "BEGIN:VCARD",
             f"VERSION:{version}",
-            f"UID:{self._vcard_escape(uid)}",
-            f"FN:{self._vcard_escape(name)}",
-            f"N:{self._vcard_escape(family)};{self._vcard_escape(given)};;;",
+            f"UID:{esc(uid)}",
+            f"FN:{esc(name)}",
+            f"N:{esc(family)};{esc(given)};;;",
+            *(template.format(esc(value)) for template, value in optional if value),
+            *(
+                f"X-SOCIALPROFILE;TYPE={social_type}:{esc(self._social_url(social_type, value))}"
+                for social_type, value in socials
+                if value
+            ),
+            "END:VCARD",
         ]
+        return "\r\n".join(lines) + "\r\n"
 
-        if org:
-            lines.append(f"ORG:{self._vcard_escape(org)}")
-        if title:
-            lines.append(f"TITLE:{self._vcard_escape(title)}")
-
-        if email:
-            lines.append(f"EMAIL;TYPE=INTERNET:{self._vcard_escape(email)}")
-        if phone:
-            lines.append(f"TEL;TYPE=CELL:{self._vcard_escape(phone)}")
-        if address:
-            lines.append(f"ADR;TYPE=HOME:;;{self._vcard_escape(address)};;;;")
-
-        if birthday:
-            # vCard 3.0: BDAY:YYYY-MM-DD (généralement accepté)
-            lines.append(f"BDAY:{self._vcard_escape(birthday)}")
-
-        if note:
-            lines.append(f"NOTE:{self._vcard_escape(note)}")
-
-        # Liens / réseaux
-        if website:
-            lines.append(f"URL:{self._vcard_escape(website)}")
-
-        def add_social(social_type: str, value: str, base: str, at_ok=True):
-            if not value:
-                return
-            url = self._normalize_handle_url(value, base=base, at_ok=at_ok)
-            lines.append(f"X-SOCIALPROFILE;TYPE={social_type}:{self._vcard_escape(url)}")
+    @staticmethod
+    def _contact_from_vobject(url: str, v) -> Contact:
+        fields = {
+            key: lines[0].value
+            for key, lines in v.contents.items()
+            if key in _CONTACT_PROPS and lines
+        }
+        return ContactManager._contact_from_fields(url, fields)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _contact_from_text(url: str, text: str) -> Contact:
+        """
+        Memoized on (url, raw vCard): a card is parsed once per process, and an edited
+        card comes back with a different body, so nothing needs invalidating.
+        """
+        fields = _parse_vcard_fast(text)
+        if fields is None:
+            import vobject
 
-        add_social("instagram", instagram, "https://instagram.com", at_ok=True)
-        add_social("linkedin", linkedin, "https://linkedin.com/in", at_ok=False)
-        add_social("github", github, "https://github.com", at_ok=False)
+            return ContactManager._contact_from_vobject(url, vobject.readOne(text))
+        return ContactManager._contact_from_fields(url, fields)
 
-        lines.append("END:VCARD")
-        return "\r\n".join(lines) + "\r\n"
-
-    def _contact_from_vobject(self, url: str, v) -> Contact:
+    @staticmethod
+    def _contact_from_fields(url: str, fields: dict) -> Contact:
         def first_value(key: str) -> str:
-            if key in v.contents and v.contents[key]:
-                val = v.contents[key][0].value
-                return "" if val is None else str(val).strip()
-            return ""
-
-        uid = first_value("uid")
-        name = first_value("fn")
-        email = first_value("email")
-        phone = first_value("tel")
-        org = first_value("org")
-        title = first_value("title")
-        birthday = first_value("bday")
-        note = first_value("note")
-        website = first_value("url")
-
-        address = ""
-        if "adr" in v.contents and v.contents["adr"]:
-            adr_val = v.contents["adr"][0].value
-            address = "" if adr_val is None else str(adr_val).strip()
+            val = fields.get(key)
+            return "" if val is None else str(val).strip()
 
         return Contact(
             url=url,
-            uid=uid,
-            name=name,
-            email=email,
-            phone=phone,
-            address=address,
-            org=org,
-            title=title,
-            birthday=birthday,
-            note=note,
-            website=website,
+            uid=first_value("uid"),
+            name=first_value("fn"),
+            email=first_value("email"),
+            phone=first_value("tel"),
+            address=first_value("adr"),
+            org=first_value("org"),
+            title=first_value("title"),
+            birthday=first_value("bday"),
+            note=first_value("note"),
+            website=first_value("url"),
         )
 
     # ----------------------------
@@ -261,12 +502,16 @@ class ContactManager(Manager[Contact]):
         )
         r.raise_for_status()
 
-        v = self.request(url)
-        return self._contact_from_vobject(url, v)
+        # The payload is what was stored: parse it rather than GETting it back.
+        # A server that rewrites the card must not send an ETag (RFC 6352), so
+        # only an unaltered card gets cached.
+        contact = self._contact_from_text(url, payload)
+        return self._cache_contact(url, r.headers.get("ETag"), contact)
 
     def delete(self, item: Contact):
         r = self._req("DELETE", item.url)
         r.raise_for_status()
+        self._cache.pop(item.url, None)
 
     def update(
         self,
@@ -286,62 +531,69 @@ class ContactManager(Manager[Contact]):
         new_twitter=None,
     ) -> Contact:
         url = item.url
-        v = self.request(url)
+        self._cache.pop(url, None)
+        r = self._req("GET", url)
+        r.raise_for_status()
+
+        # Plain properties are patched in the raw text (values escaped like in
+        # _build_vcard_text); the rest of the card is left byte-for-byte as is.
+        esc = self._vcard_escape
+        updates: dict[str, str] = {}
 
         # identité
         if new_name is not None:
-            self._set_or_add_single(v, "fn", new_name)
+            updates["FN"] = esc(new_name)
 
             parts = new_name.split()
             given = parts[0] if parts else ""
             family = parts[-1] if len(parts) > 1 else ""
-            self._set_or_add_single(v, "n", f"{family};{given};;;")
+            updates["N"] = f"{esc(family)};{esc(given)};;;"
 
         if new_org is not None:
-            self._set_or_add_single(v, "org", new_org)
+            updates["ORG"] = esc(new_org)
 
         # contact
         if new_email is not None:
-            self._set_or_add_single(v, "email", new_email)
+            updates["EMAIL"] = esc(new_email)
         if new_phone is not None:
-            self._set_or_add_single(v, "tel", new_phone)
+            updates["TEL"] = esc(new_phone)
         if new_address is not None:
-            self._set_or_add_single(v, "adr", f";;{new_address};;;;")
+            updates["ADR"] = f";;{esc(new_address)};;;;"
 
         # autres
         if new_birthday is not None:
-            self._set_or_add_single(v, "bday", new_birthday)
+            updates["BDAY"] = esc(new_birthday)
         if new_note is not None:
-            self._set_or_add_single(v, "note", new_note)
+            updates["NOTE"] = esc(new_note)
 
         # liens / réseaux
         if new_website is not None:
-            self._set_or_add_single(v, "url", new_website)
+            updates["URL"] = esc(new_website)
 
-        if new_instagram is not None:
-            ig = self._normalize_handle_url(
-                new_instagram, "https://instagram.com", at_ok=True
-            )
-            self._set_social(v, "instagram", ig)
+        payload = _patch_vcard_text(r.text, updates)
 
-        if new_linkedin is not None:
-            li = self._normalize_handle_url(
-                new_linkedin, "https://linkedin.com/in", at_ok=False
+        socials = {
+            social_type: value
+            for social_type, value in (
+                ("instagram", new_instagram),
+                ("linkedin", new_linkedin),
+                ("github", new_github),
+                ("twitter", new_twitter),
             )
-            self._set_social(v, "linkedin", li)
+            if value is not None
+        }
+        if socials:
+            # X-SOCIALPROFILE lines are matched on their TYPE param: let vobject do it
+            import vobject
 
-        if new_github is not None:
-            gh = self._normalize_handle_url(new_github, "https://github.com", at_ok=False)
-            self._set_social(v, "github", gh)
+            v = vobject.readOne(payload)
+            for social_type, value in socials.items():
+                self._set_social(v, social_type, self._social_url(social_type, value))
 
-        if new_twitter is not None:
-            tw = self._normalize_handle_url(new_twitter, "https://twitter.com", at_ok=True)
-            self._set_social(v, "twitter", tw)
-
-        payload = v.serialize()
-        payload = payload.replace("\r\n", "\n").replace("\r", "\n").replace("\n", "\r\n")
-        if not payload.endswith("\r\n"):
-            payload += "\r\n"
+            payload = v.serialize()
+            payload = _BARE_EOL.sub("\r\n", payload)
+            if not payload.endswith("\r\n"):
+                payload += "\r\n"
 
         r = self._req(
             "PUT",
@@ -351,42 +603,33 @@ class ContactManager(Manager[Contact]):
         )
         r.raise_for_status()
 
-        v2 = self.request(url)
-        return self._contact_from_vobject(url, v2)
+        return self._fetch_contact(url)
 
     # ----------------------------
     # Helpers for socials + vobject mutations
     # ----------------------------
 
     def _normalize_handle_url(self, value: str, base: str, at_ok=True) -> str:
+        # `base` has no trailing slash
         v = value.strip()
         if at_ok and v.startswith("@"):
             v = v[1:]
-        if v.startswith("http://") or v.startswith("https://"):
+        if v.startswith(("http://", "https://")):
             return v
-        return f"{base.rstrip('/')}/{v}"
-
-    def _set_or_add_single(self, v, key: str, value: str):
-        # key en minuscule (email, tel, org, title, note, bday, url...)
-        if value is None:
-            return
-        if key in v.contents and len(v.contents[key]) > 0:
-            v.contents[key][0].value = value
-        else:
-            v.add(key).value = value
+        return f"{base}/{v}"
+
+    def _social_url(self, social_type: str, value: str) -> str:
+        base, at_ok = _SOCIAL_BASES[social_type]
+        return self._normalize_handle_url(value, base, at_ok=at_ok)
 
     def _remove_social_type(self, v, social_type: str):
-        key = "x-socialprofile"
-        if key not in v.contents:
-            return
-        kept = []
-        for line in v.contents[key]:
-            t = ""
-            if "TYPE" in line.params and len(line.params["TYPE"]) > 0:
-                t = line.params["TYPE"][0]
-            if str(t).lower() != social_type.lower():
-                kept.append(line)
-        v.contents[key] = kept
+        # Delete in place, back to front, so the contents list keeps its identity.
+        profiles = v.contents.get("x-socialprofile", [])
+        target = social_type.lower()
+        for i in range(len(profiles) - 1, -1, -1):
+            types = profiles[i].params.get("TYPE")
+            if str(types[0] if types else "").lower() == target:
+                del profiles[i]
 
     def _set_social(self, v, social_type: str, url: str):
         # remplace l’entrée existante de ce type
@@ -404,7 +647,7 @@ class ContactManager(Manager[Contact]):
         Display a short list of contacts (FN + EMAIL/TEL if present).
         `limit` avoids hammering the server if you have lots of vcards.
         """
-        contacts = self.list(limit=limit)
+        contacts, total_urls = self.list_with_total(limit=limit)
 
         lines: list[str] = []
         for c in contacts:
@@ -426,30 +669,31 @@ class ContactManager(Manager[Contact]):
         if not lines:
             return "No contacts."
 
-        total_urls = len(self.list_urls())
         if len(contacts) < total_urls:
             lines.append(f"\n(showing first {limit})")
 
         return "\n".join(lines)
 
+    def _fetch_contact(self, url: str) -> Contact:
+        r = self._req("GET", url)
+        r.raise_for_status()
+        return self._contact_from_text(url, r.text)
+
     def get(self, uid: str, *, limit: int = 200) -> Contact | None:
         """
         Find a contact by vCard UID. Returns the Contact object or None.
 
-        `limit` avoids scanning your whole addressbook in huge collections.
+        The server filters on UID, so a single addressbook-query REPORT answers it.
+        A server that ignores the filter sends the whole addressbook instead:
+        `limit` caps how much of it is scanned, and the first card in its order wins.
         """
-        urls = self.list_urls()[:limit]
         target = uid.strip()
-
-        for url in urls:
-            try:
-                v = self.request(url)
-            except Exception:
-                continue
-
-            if "uid" in v.contents and v.contents["uid"] and v.contents["uid"][0].value:
-                v_uid = str(v.contents["uid"][0].value).strip()
-                if v_uid == target:
-                    return self._contact_from_vobject(url, v)
-
-        return None
\ No newline at end of file
+        uid_filter = f"""<c:filter>
+    <c:prop-filter name="UID">
+      <c:text-match collation="i;octet" match-type="equals">{escape(target)}</c:text-match>
+    </c:prop-filter>
+  </c:filter>"""
+        for contact in self._query(uid_filter, limit):
+            if contact.uid == target:
+                return contact
+        return None
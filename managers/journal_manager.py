@@ -1,14 +1,25 @@
-from datetime import datetime, time, timedelta
+import io
+from datetime import date, datetime, time, timedelta
 import caldav
 from caldav import CalendarObjectResource
 
 from managers.manager import Manager
+from managers.utils import fmt_dt, ical_text
+
+
+# Default span of list() when no end date is given
+_LIST_WINDOW = timedelta(days=30)
+
+
+def _first(contents: dict, key: str):
+    # Value of the first `key` property, from vobject's contents dict
+    lines = contents.get(key)
+    return lines[0].value if lines else None
 
 
 class JournalManager(Manager[CalendarObjectResource]):
-    def __init__(self, url: str, username: str, password: str):
-        super().__init__(url, username, password)
-        self.calendar = self.client.calendar(url=url)
+    # Whether calendar.search() accepts uid=...; see get().
+    _search_supports_uid = True
 
     def list(
         self,
@@ -17,13 +28,12 @@ class JournalManager(Manager[CalendarObjectResource]):
     ) -> list[CalendarObjectResource]:
         # Default start_date = today at 00:00 (local time)
         if start_date is None:
-            today = datetime.now().date()
-            start_date = datetime.combine(today, time.min)
+            start_date = datetime.combine(date.today(), time.min)
 
         # Journals don’t always have natural “end”, but caldav search with a window
         # is still useful to keep results bounded and fast.
         if end_date is None:
-            end_date = start_date + timedelta(days=30)
+            end_date = start_date + _LIST_WINDOW
 
         # expand=True is not relevant for journals (no recurrences), so keep it off.
         return self.calendar.search(
@@ -33,7 +43,8 @@ class JournalManager(Manager[CalendarObjectResource]):
         )
 
     def add(self, title: str, desc: str = "") -> CalendarObjectResource:
-        return self.calendar.save_journal(summary=title, description=desc)
+        lines = [f"SUMMARY:{ical_text(title)}", f"DESCRIPTION:{ical_text(desc)}"]
+        return self._create(caldav.Journal, "VJOURNAL", lines)
 
     def delete(self, item: CalendarObjectResource) -> None:
         item.delete()
@@ -52,16 +63,9 @@ class JournalManager(Manager[CalendarObjectResource]):
         j = v.vjournal
 
         if new_title is not None:
-            if hasattr(j, "summary"):
-                j.summary.value = new_title
-            else:
-                j.add("summary").value = new_title
-
+            self._set_or_add(j, "summary", new_title)
         if new_desc is not None:
-            if hasattr(j, "description"):
-                j.description.value = new_desc
-            else:
-                j.add("description").value = new_desc
+            self._set_or_add(j, "description", new_desc)
 
         item.save()
         return item
@@ -82,56 +86,36 @@ class JournalManager(Manager[CalendarObjectResource]):
         if limit is not None:
             items = items[:limit]
 
-        def _fmt_dt(dt: object) -> str:
-            if isinstance(dt, datetime):
-                return dt.strftime("%Y-%m-%d %H:%M")
-            try:
-                return dt.strftime("%Y-%m-%d")  # type: ignore[attr-defined]
-            except Exception:
-                return str(dt)
-
-        lines: list[str] = []
+        buf = io.StringIO()
+        w = buf.write
         for item in items:
             v = item.vobject_instance
             if not hasattr(v, "vjournal"):
                 continue
-            j = v.vjournal
-
-            title = str(j.summary.value)
-            uid = str(j.uid.value)
-            desc = ""
-            if (
-                hasattr(j, "description")
-                and hasattr(j.description, "value")
-                and j.description.value
-            ):
-                desc = str(j.description.value)
+            j = v.vjournal.contents
+
+            title = str(_first(j, "summary") or "(no title)")
+            uid = str(_first(j, "uid"))
+            desc = str(_first(j, "description") or "")
 
             # Journals may expose a date-like field as DTSTAMP or DTSTART depending on server/client.
             # We’ll pick the best available in this order.
             dt = None
-            if hasattr(j, "dtstart") and hasattr(j.dtstart, "value"):
-                dt = j.dtstart.value
-            elif hasattr(j, "dtstamp") and hasattr(j.dtstamp, "value"):
-                dt = j.dtstamp.value
-            elif hasattr(j, "created") and hasattr(j.created, "value"):
-                dt = j.created.value
+            for key in ("dtstart", "dtstamp", "created"):
+                if j.get(key):
+                    dt = _first(j, key)
+                    break
 
-            when = _fmt_dt(dt) if dt is not None else "(no date)"
+            when = fmt_dt(dt) if dt is not None else "(no date)"
 
-            lines.append(f"- {when}  {title}")
-            lines.append(f"  UID: {uid}")
+            w(f"- {when}  {title}\n")
+            w(f"  UID: {uid}\n")
             if desc:
-                lines.append(f"  Description: {desc}")
-            lines.append("")
+                w(f"  Description: {desc}\n")
+            w("\n")
 
-        if not lines:
-            return "No journals."
-
-        if lines[-1] == "":
-            lines.pop()
-
-        return "\n".join(lines)
+        # Every entry ends with a blank line: drop the last one
+        return buf.getvalue()[:-2] or "No journals."
 
     def get(self, uid: str) -> CalendarObjectResource | None:
         """
@@ -139,21 +123,17 @@ class JournalManager(Manager[CalendarObjectResource]):
         Returns the first match, or None if not found.
         """
         # Some CalDAV servers support uid=... in search() for journals; try it first.
+        if JournalManager._search_supports_uid:
+            try:
+                results = self.calendar.search(uid=uid, journal=True)
+                return results[0] if results else None
+            except TypeError:
+                # Backend doesn't accept uid=... in search()
+                JournalManager._search_supports_uid = False
+
+        # Fallback: a UID text-match REPORT over the whole collection, which also
+        # finds journals outside list()'s default window.
         try:
-            results = self.calendar.search(uid=uid, journal=True)
-            if results:
-                return results[0]
-        except TypeError:
-            # Backend doesn't accept uid=... in search()
-            pass
-
-        # Fallback: scan a bounded window and match UID client-side.
-        for item in self.list():
-            v = item.vobject_instance
-            if not hasattr(v, "vjournal"):
-                continue
-            j = v.vjournal
-            if hasattr(j, "uid") and hasattr(j.uid, "value") and j.uid.value == uid:
-                return item
-
-        return None
\ No newline at end of file
+            return self.calendar.journal_by_uid(uid)
+        except caldav.error.NotFoundError:
+            return None
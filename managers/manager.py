@@ -1,19 +1,78 @@
+import functools
+import inspect
+import uuid
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import TYPE_CHECKING, Generic, List, TypeVar
 
 import caldav
-import requests
-import vobject
+
+from managers.utils import vcalendar
+
+if TYPE_CHECKING:
+    from vobject.base import Component
 
 T = TypeVar("T")
 
+_GETETAG = "{DAV:}getetag"
+
+# The only methods resent after a dropped connection: plain reads
+_RETRIED_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PROPFIND"))
+
+
+@functools.lru_cache(maxsize=None)
+def get_client(url: str, username: str, password: str) -> caldav.DAVClient:
+    """
+    One DAVClient per collection/account, shared by every manager built against it,
+    so they reuse the same pooled keep-alive session instead of reconnecting.
+    """
+    client = caldav.DAVClient(url, username=username, password=password)
+    for prefix in ("https://", "http://"):
+        client.session.mount(prefix, _pooled_adapter(client.session.get_adapter(prefix)))
+    return client
+
+
+def _pooled_adapter(adapter):
+    """
+    Copy of one of caldav's session adapters (niquests or requests) with a larger pool
+    and a couple of retries on dropped connections. Every other setting caldav's
+    session gave it (HTTP versions, QUIC cache, keep-alive, TLS...) is kept.
+    """
+    params = inspect.signature(type(adapter)).parameters
+    kwargs = {
+        name[1:]: value
+        for name, value in vars(adapter).items()
+        if name.startswith("_") and name[1:] in params
+    }
+    kwargs.update(pool_connections=4, pool_maxsize=16)
+    # Writes and REPORTs are never sent twice
+    kwargs["max_retries"] = adapter.max_retries.new(
+        total=2, read=None, allowed_methods=_RETRIED_METHODS
+    )
+    return type(adapter)(**kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def get_calendar(url: str, username: str, password: str) -> caldav.Calendar:
+    """
+    Calendar handle of a collection, shared like its client.
+    Building one doesn't touch the network: the URL is used as is, without principal discovery.
+    """
+    return get_client(url, username, password).calendar(url=url)
+
+
 class Manager(ABC, Generic[T]):
     def __init__(self, webdav_url: str, username: str, password: str):
         if not webdav_url.endswith("/"):
             webdav_url += "/"
         self.base = webdav_url
         self.auth = (username, password)
-        self.client = caldav.DAVClient(self.base, username=username, password=password)
+        self.client = get_client(self.base, username, password)
+        # url -> (etag, body) of what request() downloaded, for conditional GETs
+        self._etag_cache: dict[str, tuple[str, str]] = {}
+
+    @functools.cached_property
+    def calendar(self) -> caldav.Calendar:
+        return get_calendar(self.base, *self.auth)
 
     @abstractmethod
     def list(self, *args, **kwargs) -> list[T]:
@@ -40,17 +99,97 @@ class Manager(ABC, Generic[T]):
         raise NotImplementedError
 
     def request(self, url: str, **kwargs):
-        r = requests.get(url, auth=self.auth, timeout=20, **kwargs)
+        """
+        GET and parse a single DAV object. A body seen before is revalidated with
+        If-None-Match, and reused as is when the server answers 304.
+        """
+        import vobject
+
+        cached = self._etag_cache.get(url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        # Through the client's pooled session rather than a one-off connection
+        r = self.client.session.get(url, auth=self.auth, timeout=20, headers=headers, **kwargs)
+        if cached and r.status_code == 304:
+            return vobject.readOne(cached[1])
         r.raise_for_status()
+
+        etag = r.headers.get("ETag")
+        if etag:
+            self._etag_cache[url] = (etag, r.text)
         return vobject.readOne(r.text)
 
+    def _create(self, resource_cls, component: str, lines: List[str]):
+        """
+        PUT a new `component` made of these (already escaped) content lines under a
+        fresh UID, and return it as a `resource_cls` (caldav.Todo, caldav.Journal...).
+        The text is written directly instead of going through caldav's save_*() builders.
+        """
+        uid = str(uuid.uuid4())
+        url = f"{self.base}{uid}.ics"
+        ics = vcalendar(component, uid, lines)
+        r = self.client.session.put(
+            url,
+            auth=self.auth,
+            timeout=20,
+            headers={"Content-Type": "text/calendar; charset=utf-8", "If-None-Match": "*"},
+            data=ics.encode("utf-8"),
+        )
+        r.raise_for_status()
+        obj = resource_cls(client=self.client, url=url, data=ics, parent=self.calendar)
+        self._remember_etag(obj, r)
+        return obj
+
+    def _replace(self, item, ics: str) -> None:
+        """
+        PUT new text for an existing object, guarded with If-Match when its ETag is
+        known, and keep `item` in sync with what was stored.
+        """
+        headers = {"Content-Type": "text/calendar; charset=utf-8"}
+        etag = item.props.get(_GETETAG)
+        if etag:
+            headers["If-Match"] = etag
+        r = self.client.session.put(
+            str(item.url),
+            auth=self.auth,
+            timeout=20,
+            headers=headers,
+            data=ics.encode("utf-8"),
+        )
+        r.raise_for_status()
+        item.data = ics
+        self._remember_etag(item, r)
+
+    @staticmethod
+    def _remember_etag(item, response) -> None:
+        # A server that altered what it stored sends no ETag: forget the old one then
+        etag = response.headers.get("ETag")
+        if etag:
+            item.props[_GETETAG] = etag
+        else:
+            item.props.pop(_GETETAG, None)
+
+    @staticmethod
+    def _set_or_add(component: "Component", key: str, value) -> None:
+        """
+        Set an existing vobject property or add it if absent.
+        Uses .contents so we don't rely on getattr()/normalized attribute names.
+        """
+        lines = component.contents.get(key.lower())
+        if lines:
+            lines[0].value = value
+        else:
+            component.add(key).value = value
+
     @staticmethod
     def display(item: T) -> str:
         """
         Default: dump the raw DAV representation (ICS/VCF) if possible.
         Managers may override to provide a prettier view.
         """
-        if hasattr(item, "data"):
+        try:
             return item.data
-        return item.serialize()
-
+        except AttributeError:
+            return item.serialize()
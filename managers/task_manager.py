@@ -1,16 +1,75 @@
-from datetime import date, datetime, timezone
+import functools
+import io
+import re
+import time
+from datetime import date, datetime
 from typing import Optional, List
 
 import caldav
-from vobject.base import Component
+from dateutil import tz
+from vobject.icalendar import stringToTextValues
 
 from managers.manager import Manager
+from managers.utils import (
+    fmt_dt,
+    ical_date_line,
+    ical_text,
+    patch_component,
+    scan_component,
+)
 from caldav import CalendarObjectResource
 
+# VTODO properties read by summary() and _is_completed(), and those of them holding text
+_TODO_PROPS = frozenset(
+    ("summary", "uid", "status", "description", "dtstart", "due", "percent-complete", "completed")
+)
+_TODO_TEXT_PROPS = frozenset(("summary", "uid", "status", "description"))
+_COMPLETE_HINT = re.compile("complete", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> date | datetime:
+    # Date only (e.g. "2025-06-15"): Python 3.11+ would otherwise read it as a midnight datetime
+    if len(value) == 10:
+        return date.fromisoformat(value)
+    # Full datetime (e.g. "2025-06-15T09:00:00")
+    return datetime.fromisoformat(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def _scan_todo(data: str) -> dict[str, object] | None:
+    """
+    TaskManager._todo_fields() of an ICS text, memoized on the text itself so that
+    list() and summary() scan each task once, and an edited task is simply rescanned.
+    Callers must not mutate the returned dict.
+    """
+    raw = scan_component(data, "VTODO", _TODO_PROPS)
+    if raw is None:
+        return None
+    fields: dict[str, object] = {}
+    for key, value in raw.items():
+        if key in _TODO_TEXT_PROPS:
+            value = stringToTextValues(value)[0]
+        elif key in ("dtstart", "due"):
+            value = _ical_dt(value)
+        fields[key] = value
+    return fields
+
+
+def _ical_dt(value: str) -> date | datetime | str:
+    # Wall-clock value of a DATE or DATE-TIME, which is all summary() prints
+    value = value.strip()
+    try:
+        if "T" in value:
+            return datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+        return datetime.strptime(value, "%Y%m%d").date()
+    except ValueError:
+        return value
+
+
 class TaskManager(Manager[CalendarObjectResource]):
-    def __init__(self, url: str, username: str, password: str):
-        super().__init__(url, username, password)
-        self.calendar = self.client.calendar(url=url)
+    # Whether calendar.search() accepts uid=...; see get().
+    _search_supports_uid = True
 
     # ------------------------------------------------------------------
     # CRUD
@@ -19,14 +78,23 @@ class TaskManager(Manager[CalendarObjectResource]):
     def list(
         self,
         *,
+        start: Optional[date | datetime] = None,
+        end: Optional[date | datetime] = None,
         include_completed: bool = False,
     ) -> list[caldav.CalendarObjectResource]:
-        """Return all VTODO items in the calendar.
+        """Return the VTODO items in the calendar, or those within [start, end).
 
         By default completed tasks (STATUS:COMPLETED / PERCENT-COMPLETE:100)
-        are excluded, mirroring the typical UI behaviour.
+        are excluded, mirroring the typical UI behaviour.  The window (or else
+        the completed filter) is applied by the server, so only matching tasks
+        are downloaded; PERCENT-COMPLETE:100 is always checked client-side.
         """
-        todos = self.calendar.search(todo=True)
+        window = {k: v for k, v in (("start", start), ("end", end)) if v is not None}
+        # caldav's pending-only filter, combined with a time-range, matches nothing on
+        # some servers (Radicale): within a window, completed tasks are dropped below.
+        todos = self.calendar.search(
+            todo=True, include_completed=include_completed or bool(window), **window
+        )
         if include_completed:
             return todos
         return [t for t in todos if not self._is_completed(t)]
@@ -62,28 +130,25 @@ class TaskManager(Manager[CalendarObjectResource]):
         location:         Location string.
         url:              Related URL.
         """
-        kwargs: dict = {
-            "summary": title,
-            "priority": priority,
-        }
+        lines = [f"SUMMARY:{ical_text(title)}", f"PRIORITY:{priority}"]
         if description is not None:
-            kwargs["description"] = description
+            lines.append(f"DESCRIPTION:{ical_text(description)}")
         if due is not None:
-            kwargs["due"] = self._parse_dt(due)
+            lines.append(ical_date_line("DUE", self._parse_dt(due)))
         if start is not None:
-            kwargs["dtstart"] = self._parse_dt(start)
-        if status is not None:
-            kwargs["status"] = status.upper()
+            lines.append(ical_date_line("DTSTART", self._parse_dt(start)))
+        # save_todo() used to default the status the same way
+        lines.append(f"STATUS:{(status or 'NEEDS-ACTION').upper()}")
         if percent_complete is not None:
-            kwargs["percent_complete"] = percent_complete
+            lines.append(f"PERCENT-COMPLETE:{percent_complete}")
         if categories is not None:
-            kwargs["categories"] = categories
+            lines.append("CATEGORIES:" + ",".join(ical_text(c) for c in categories))
         if location is not None:
-            kwargs["location"] = location
+            lines.append(f"LOCATION:{ical_text(location)}")
         if url is not None:
-            kwargs["url"] = url
+            lines.append(f"URL:{url}")
 
-        return self.calendar.save_todo(**kwargs)
+        return self._create(caldav.Todo, "VTODO", lines)
 
     def delete(self, item: caldav.CalendarObjectResource) -> None:
         """Delete a task."""
@@ -146,41 +211,72 @@ class TaskManager(Manager[CalendarObjectResource]):
         item: caldav.CalendarObjectResource,
     ) -> caldav.CalendarObjectResource:
         """Mark a task as completed (STATUS:COMPLETED, PERCENT-COMPLETE:100)."""
-        now = datetime.now(timezone.utc).replace(microsecond=0)
-        return self.update(
-            item,
-            new_status="COMPLETED",
-            new_percent_complete=100,
-            new_completed=now,
-        )
+        # Whole seconds, straight from the clock. dateutil's UTC, as vobject can't
+        # serialize datetime.timezone.utc.
+        now = datetime.fromtimestamp(int(time.time()), tz.UTC)
+
+        # Three fixed values: patch the stored text and PUT it back, rather than a
+        # vobject parse and re-serialization.
+        updates = {
+            "STATUS": "COMPLETED",
+            "PERCENT-COMPLETE": "100",
+            "COMPLETED": f"{now:%Y%m%dT%H%M%SZ}",
+        }
+        patched = patch_component(item.data, "VTODO", updates) if item.data else None
+        if patched is None:
+            # No VTODO in the text: let update() raise its ValueError
+            return self.update(
+                item,
+                new_status="COMPLETED",
+                new_percent_complete=100,
+                new_completed=now,
+            )
+        self._replace(item, patched)
+        return item
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
-    def _is_completed(self, item: caldav.CalendarObjectResource) -> bool:
-        try:
+    def _todo_fields(self, item: caldav.CalendarObjectResource) -> dict[str, object] | None:
+        """
+        Values of the _TODO_PROPS set on the task's VTODO, decoded like vobject does.
+        They are scanned from the ICS text; only tasks the scanner can't read get
+        a full vobject parse. None when there is no VTODO.
+        """
+        data = item.data
+        fields = _scan_todo(data) if data else None
+        if fields is None:
             v = item.vobject_instance
             if not hasattr(v, "vtodo"):
+                return None
+            contents = v.vtodo.contents
+            return {key: contents[key][0].value for key in _TODO_PROPS if contents.get(key)}
+        return fields
+
+    def _is_completed(self, item: caldav.CalendarObjectResource) -> bool:
+        try:
+            # STATUS:COMPLETED, PERCENT-COMPLETE and COMPLETED all spell "complete":
+            # a task whose text never does is pending, without scanning its properties.
+            if item.data and not _COMPLETE_HINT.search(item.data):
+                return False
+            fields = self._todo_fields(item)
+            if fields is None:
                 return False
-            td = v.vtodo
 
             # STATUS:COMPLETED
-            if "status" in td.contents and td.contents["status"]:
-                val = td.contents["status"][0].value
-                if val and str(val).upper() == "COMPLETED":
-                    return True
+            val = fields.get("status")
+            if val and str(val).upper() == "COMPLETED":
+                return True
 
-            # PERCENT-COMPLETE:100 (vobject key is usually "percent-complete")
-            if "percent-complete" in td.contents and td.contents["percent-complete"]:
-                val = td.contents["percent-complete"][0].value
-                if val is not None and str(val) == "100":
-                    return True
+            # PERCENT-COMPLETE:100
+            val = fields.get("percent-complete")
+            if val is not None and str(val) == "100":
+                return True
 
             # COMPLETED:<timestamp> is also a strong signal
-            if "completed" in td.contents and td.contents["completed"]:
-                if td.contents["completed"][0].value:
-                    return True
+            if fields.get("completed"):
+                return True
         except Exception:
             pass
         return False
@@ -194,115 +290,67 @@ class TaskManager(Manager[CalendarObjectResource]):
         """
         if isinstance(value, (date, datetime)):
             return value
-        value = value.strip()
-        try:
-            # Full datetime (e.g. "2025-06-15T09:00:00")
-            return datetime.fromisoformat(value)
-        except ValueError:
-            pass
-        # Date only (e.g. "2025-06-15")
-        return date.fromisoformat(value)
-
-    @staticmethod
-    def _set_or_add(component: Component, key: str, value) -> None:
-        """
-        Set an existing vobject property or add it if absent.
-        Uses .contents so we don't rely on getattr()/normalized attribute names.
-        """
-        key = key.lower()
-        if key in component.contents and component.contents[key]:
-            component.contents[key][0].value = value
-        else:
-            component.add(key).value = value
+        return _parse_iso(value.strip())
 
 
     def get(self, uid: str) -> caldav.CalendarObjectResource | None:
         """
-        Find a single VTODO by its iCal UID.
+        Find a single VTODO by its iCal UID, completed or not.
         Returns the first match, or None if not found.
         """
         # Some CalDAV servers support uid=... in search(); some don't.
-        try:
-            results = self.calendar.search(uid=uid, todo=True)
-            if results:
-                return results[0]
-        except TypeError:
-            pass
-
-        # Fallback: scan all todos and match UID client-side
-        for item in self.calendar.search(todo=True):
-            v = item.vobject_instance
-            if not hasattr(v, "vtodo"):
-                continue
-            td = v.vtodo
-            if str(td.contents["uid"][0].value) == uid:
-                return item
+        if TaskManager._search_supports_uid:
+            try:
+                results = self.calendar.search(uid=uid, todo=True, include_completed=True)
+                return results[0] if results else None
+            except TypeError:
+                TaskManager._search_supports_uid = False
 
-        return None
+        # Fallback: a UID text-match REPORT, rather than scanning every todo client-side
+        try:
+            return self.calendar.todo_by_uid(uid)
+        except caldav.error.NotFoundError:
+            return None
 
-    def summary(self, *, include_completed: bool = False) -> str:
+    def summary(
+        self,
+        *,
+        start: Optional[date | datetime] = None,
+        end: Optional[date | datetime] = None,
+        include_completed: bool = False,
+    ) -> str:
         """
-        Return a string list of tasks.
+        Return a string list of tasks (within [start, end) if given).
         Each item displays: title, UID, status, due/start (if any).
         """
-        items = self.list(include_completed=include_completed)
-
-        def _fmt_dt(dt: object) -> str:
-            if isinstance(dt, datetime):
-                return dt.strftime("%Y-%m-%d %H:%M")
-            try:
-                return dt.strftime("%Y-%m-%d")  # type: ignore[attr-defined]
-            except Exception:
-                return str(dt)
+        items = self.list(start=start, end=end, include_completed=include_completed)
 
-        lines: list[str] = []
+        buf = io.StringIO()
+        w = buf.write
         for item in items:
-            v = item.vobject_instance
-            if not hasattr(v, "vtodo"):
+            fields = self._todo_fields(item)
+            if fields is None:
                 continue
-            td = v.vtodo
-
-            title = "(no title)"
-            if "summary" in td.contents and td.contents["summary"] and td.contents["summary"][0].value:
-                title = str(td.contents["summary"][0].value)
 
-            uid = None
-            if "uid" in td.contents and td.contents["uid"] and td.contents["uid"][0].value:
-                uid = str(td.contents["uid"][0].value)
+            title = str(fields["summary"]) if fields.get("summary") else "(no title)"
+            uid = str(fields["uid"]) if fields.get("uid") else None
+            status = str(fields["status"]) if fields.get("status") else None
+            due = fields.get("due") or None
+            start = fields.get("dtstart") or None
+            desc = fields.get("description") or None
 
-            status = None
-            if "status" in td.contents and td.contents["status"] and td.contents["status"][0].value:
-                status = str(td.contents["status"][0].value)
-
-            due = None
-            if "due" in td.contents and td.contents["due"] and td.contents["due"][0].value:
-                due = td.contents["due"][0].value
-
-            start = None
-            if "dtstart" in td.contents and td.contents["dtstart"] and td.contents["dtstart"][0].value:
-                start = td.contents["dtstart"][0].value
-
-            desc = None
-            if "description" in td.contents and td.contents["description"] and td.contents["description"][0].value:
-                desc = td.contents["description"][0].value
-
-            lines.append(f"- {title}")
+            w(f"- {title}\n")
             if uid:
-                lines.append(f"  UID: {uid}")
+                w(f"  UID: {uid}\n")
             if desc:
-                lines.append(f"  Description: {desc}")
+                w(f"  Description: {desc}\n")
             if status:
-                lines.append(f"  Status: {status}")
+                w(f"  Status: {status}\n")
             if start is not None:
-                lines.append(f"  Start: {_fmt_dt(start)}")
+                w(f"  Start: {fmt_dt(start)}\n")
             if due is not None:
-                lines.append(f"  Due: {_fmt_dt(due)}")
-            lines.append("")
-
-        if not lines:
-            return "No tasks."
-
-        if lines[-1] == "":
-            lines.pop()
+                w(f"  Due: {fmt_dt(due)}\n")
+            w("\n")
 
-        return "\n".join(lines)
\ No newline at end of file
+        # Every entry ends with a blank line: drop the last one
+        return buf.getvalue()[:-2] or "No tasks."
\ No newline at end of file
@@ -1,6 +1,114 @@
+import functools
 import os
+import re
+from datetime import date, datetime, timezone
 from typing import Union, Sequence
 
+# Folded continuation lines start with a space or a tab
+_UNFOLD = re.compile(r"\r?\n[ \t]")
+# iCalendar TEXT escaping (RFC 5545 3.3.11)
+_ICAL_ESCAPE = str.maketrans({"\\": "\\\\", "\n": "\\n", ";": r"\;", ",": r"\,"})
+
+
+def fmt_dt(dt: object) -> str:
+    """
+    How summaries print a property value: "YYYY-MM-DD HH:MM" for a datetime,
+    "YYYY-MM-DD" for a date, str() for anything else.
+    """
+    if isinstance(dt, datetime):
+        return dt.strftime("%Y-%m-%d %H:%M")
+    try:
+        return dt.strftime("%Y-%m-%d")  # type: ignore[attr-defined]
+    except Exception:
+        return str(dt)
+
+
+def normalize_emails(emails: Union[str, Sequence[str]]) -> list[str]:
+    """
+    Strip and de-dupe (case-insensitively) attendee emails, preserving order.
+
+    Raises:
+        ValueError: If no email is left.
+    """
+    if isinstance(emails, str):
+        email_list = [emails]
+    else:
+        email_list = list(emails)
+
+    # Normalize/dedupe while keeping order: the first spelling of each email wins
+    by_lower: dict[str, str] = {}
+    for e in email_list:
+        e = e.strip()
+        if e:
+            by_lower.setdefault(e.lower(), e)
+    cleaned = list(by_lower.values())
+
+    if not cleaned:
+        raise ValueError("No attendee emails provided.")
+    return cleaned
+
+
+def event_lookup_request(service, calendar_id: str, ical_uid: str):
+    """
+    Unexecuted events().list request finding the Google event(s) with this iCalUID,
+    so it can be executed alone or added to a BatchHttpRequest.
+    """
+    return service.events().list(
+        calendarId=calendar_id,
+        iCalUID=ical_uid,
+        maxResults=10,
+        singleEvents=False,
+    )
+
+
+def single_event(resp: dict, ical_uid: str) -> dict:
+    """
+    Pick the only event out of an event_lookup_request() response.
+
+    Raises:
+        ValueError: If the event can't be found or multiple matches are found.
+    """
+    items = resp.get("items", [])
+    if len(items) == 0:
+        raise ValueError(
+            f"No Google event found with iCalUID={ical_uid!r}. "
+            "It may not have synced yet, or it synced into a different calendar."
+        )
+    if len(items) > 1:
+        # This can happen in edge cases (duplicates, moved events, etc.)
+        ids = [it.get("id") for it in items]
+        raise ValueError(
+            f"Multiple Google events found for iCalUID={ical_uid!r}: {ids}. "
+            "Refine your selection logic (e.g., by start time) before inviting."
+        )
+    return items[0]
+
+
+def patch_attendees_request(
+    service,
+    calendar_id: str,
+    event: dict,
+    emails: list[str],
+    *,
+    send_updates: str = "all",
+    keep_existing: bool = True,
+):
+    """
+    Unexecuted events().patch request adding `emails` (already normalized) as attendees
+    of `event`, sending invitations via Google (sendUpdates).
+    """
+    attendees = event.get("attendees", []) if keep_existing else []
+    have = frozenset(a["email"].lower() for a in attendees if a.get("email"))
+    attendees.extend({"email": e} for e in emails if e.lower() not in have)
+    patch_body = {"attendees": attendees}
+
+    return service.events().patch(
+        calendarId=calendar_id,
+        eventId=event["id"],
+        body=patch_body,
+        sendUpdates=send_updates,  # "all" is the usual invite behavior
+    )
+
 
 def invite_attendees_by_icaluid(
     service,
@@ -28,100 +136,258 @@ def invite_attendees_by_icaluid(
         ValueError: If the event can't be found or multiple matches are found.
     """
     calendar_id = os.environ["GOOGLE_CALENDAR_ID"]
+    cleaned = normalize_emails(emails)
 
-    if isinstance(emails, str):
-        email_list = [emails]
-    else:
-        email_list = list(emails)
+    # 1) Find the Google event by iCalUID (VEVENT UID)
+    resp = event_lookup_request(service, calendar_id, ical_uid).execute()
+    event = single_event(resp, ical_uid)
 
-    # Normalize/dedupe while keeping order
-    seen = set()
-    cleaned: list[str] = []
-    for e in email_list:
-        e2 = e.strip()
-        if not e2:
-            continue
-        e2_lower = e2.lower()
-        if e2_lower in seen:
-            continue
-        seen.add(e2_lower)
-        cleaned.append(e2)
+    # 2) Merge attendees, 3) patch event and send invites
+    return patch_attendees_request(
+        service,
+        calendar_id,
+        event,
+        cleaned,
+        send_updates=send_updates,
+        keep_existing=keep_existing,
+    ).execute()
 
-    if not cleaned:
-        raise ValueError("No attendee emails provided.")
 
-    # 1) Find the Google event by iCalUID (VEVENT UID)
-    resp = (
-        service.events()
-        .list(
-            calendarId=calendar_id,
-            iCalUID=ical_uid,
-            maxResults=10,
-            singleEvents=False,
+# Most subrequests Google accepts in one BatchHttpRequest
+_BATCH_LIMIT = 1000
+
+
+def _execute_batched(service, calls: list[tuple[str, object]]) -> dict:
+    """
+    Execute (request_id, request) pairs through BatchHttpRequests of at most
+    _BATCH_LIMIT subrequests. Returns {request_id: response or exception}.
+    """
+    results: dict = {}
+
+    def _collect(request_id, response, exception):
+        results[request_id] = exception if exception is not None else response
+
+    for i in range(0, len(calls), _BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=_collect)
+        for request_id, request in calls[i : i + _BATCH_LIMIT]:
+            batch.add(request, request_id=request_id)
+        batch.execute()
+    return results
+
+
+def invite_attendees_batch(
+    service,
+    entries: Sequence[tuple[str, Union[str, Sequence[str]]]],
+    *,
+    send_updates: str = "all",
+    keep_existing: bool = True,
+) -> dict:
+    """
+    invite_attendees_by_icaluid() for many events at once: all the lookups go out in
+    one batched HTTP request, then all the patches in a second one.
+
+    Args:
+        service: Authorized googleapiclient.discovery.build("calendar", "v3", ...) service.
+        entries: (ical_uid, emails) pairs; a UID listed twice gets all its emails.
+        send_updates: "all" | "externalOnly" | "none".
+        keep_existing: If True, merges with existing attendees; if False, replaces.
+
+    Returns:
+        {ical_uid: updated Google event resource (dict), or the exception that
+        prevented inviting to that event}.
+    """
+    calendar_id = os.environ["GOOGLE_CALENDAR_ID"]
+
+    wanted: dict[str, list[str]] = {}
+    for ical_uid, emails in entries:
+        wanted.setdefault(ical_uid, []).extend(
+            [emails] if isinstance(emails, str) else emails
         )
-        .execute()
+
+    results: dict = {}
+    cleaned: dict[str, list[str]] = {}
+    for ical_uid, emails in wanted.items():
+        try:
+            cleaned[ical_uid] = normalize_emails(emails)
+        except ValueError as e:
+            results[ical_uid] = e
+
+    # 1) Find the Google events by iCalUID (VEVENT UID)
+    lookups = _execute_batched(
+        service,
+        [(uid, event_lookup_request(service, calendar_id, uid)) for uid in cleaned],
     )
 
-    items = resp.get("items", [])
-    if len(items) == 0:
-        raise ValueError(
-            f"No Google event found with iCalUID={ical_uid!r}. "
-            "It may not have synced yet, or it synced into a different calendar."
-        )
-    if len(items) > 1:
-        # This can happen in edge cases (duplicates, moved events, etc.)
-        ids = [it.get("id") for it in items]
-        raise ValueError(
-            f"Multiple Google events found for iCalUID={ical_uid!r}: {ids}. "
-            "Refine your selection logic (e.g., by start time) before inviting."
+    # 2) Merge attendees, 3) patch events and send invites
+    patches = []
+    for ical_uid, resp in lookups.items():
+        try:
+            if isinstance(resp, Exception):
+                raise resp
+            event = single_event(resp, ical_uid)
+        except Exception as e:
+            results[ical_uid] = e
+            continue
+        patches.append(
+            (
+                ical_uid,
+                patch_attendees_request(
+                    service,
+                    calendar_id,
+                    event,
+                    cleaned[ical_uid],
+                    send_updates=send_updates,
+                    keep_existing=keep_existing,
+                ),
+            )
         )
 
-    event = items[0]
-    event_id = event["id"]
-
-    # 2) Merge attendees
-    new_attendees = [{"email": e} for e in cleaned]
-
-    if keep_existing:
-        existing = event.get("attendees", [])
-        existing_emails_lower = {
-            a.get("email", "").lower() for a in existing if a.get("email")
-        }
-        for a in new_attendees:
-            if a["email"].lower() not in existing_emails_lower:
-                existing.append(a)
-        patch_body = {"attendees": existing}
-    else:
-        patch_body = {"attendees": new_attendees}
-
-    # 3) Patch event and send invites
-    updated = (
-        service.events()
-        .patch(
-            calendarId=calendar_id,
-            eventId=event_id,
-            body=patch_body,
-            sendUpdates=send_updates,  # "all" is the usual invite behavior
-        )
-        .execute()
-    )
+    results.update(_execute_batched(service, patches))
+    return results
 
-    return updated
+
+SYNC_WEBHOOK_URL = "https://n8n.auragan.fr/webhook/sync_calendars"
+
+
+@functools.lru_cache(maxsize=None)
+def _sync_session():
+    # Built on first use and kept for the process, so repeated syncs reuse the
+    # same keep-alive connection.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
 
 
 def sync_caldav_google():
-    import subprocess
+    """
+    Trigger the n8n workflow syncing the CalDAV calendar with Google Calendar.
 
+    Raises:
+        requests.HTTPError: If the webhook doesn't answer with a 2xx status.
+    """
     n8n_id = os.environ["N8N_USER"]
     n8n_pass = os.environ["N8N_PASSWORD"]
 
-    out = subprocess.run(
+    r = _sync_session().get(SYNC_WEBHOOK_URL, auth=(n8n_id, n8n_pass), timeout=15)
+    r.raise_for_status()
+    print("Synced local Caldav with Google Calendar successfully")
+
+
+@functools.lru_cache(maxsize=None)
+def _property_re(names: frozenset[str]) -> re.Pattern:
+    # Content lines of `names`, BEGIN or END: (name, ";params:value" / ":value")
+    alternatives = "|".join(re.escape(n) for n in sorted(names | {"begin", "end"}))
+    return re.compile(rf"^({alternatives})([;:][^\r\n]*)", re.IGNORECASE | re.MULTILINE)
+
+
+def scan_component(ics: str, component: str, names: frozenset[str]) -> dict[str, str] | None:
+    """
+    Raw value of the first occurrence of each property in `names` (lowercase), read
+    directly inside the first `component` (e.g. "VTODO") of an iCalendar text without
+    building a vobject tree. Lines of nested components (VALARM...) are skipped.
+
+    Returns None when the component is missing or a wanted property has quoted
+    parameters: those need the full parser.
+    """
+    found: dict[str, str] = {}
+    depth = None  # None until the component starts, then the nesting level inside it
+    # A single compiled pattern picks out the relevant lines; the others never reach Python.
+    for m in _property_re(names).finditer(_UNFOLD.sub("", ics)):
+        name = m.group(1).lower()
+        params, sep, value = m.group(2).partition(":")
+        if not sep:
+            continue
+        if name == "begin":
+            if depth is not None:
+                depth += 1
+            elif value.strip().upper() == component:
+                depth = 0
+        elif depth is None:
+            continue
+        elif name == "end":
+            if depth == 0:
+                return found
+            depth -= 1
+        elif depth == 0 and name not in found:
+            if '"' in params:
+                return None
+            found[name] = value
+    return None
+
+
+def patch_component(ics: str, component: str, updates: dict[str, str]) -> str | None:
+    """
+    Replace the first line of each NAME in `updates` directly inside the first
+    `component` with NAME:value (values already escaped); properties it lacks are
+    added before its END. Every other line is kept as is.
+
+    Returns None when the component is missing.
+    """
+    pending = dict(updates)
+    out: list[str] = []
+    depth = None  # as in scan_component(); False once the component is done
+    for line in _UNFOLD.sub("", ics).split("\n"):
+        line = line.rstrip("\r")
+        if not line:
+            continue
+        if depth is not False:
+            head, _, value = line.partition(":")
+            name = head.split(";", 1)[0].upper()
+            if name == "BEGIN":
+                if depth is not None:
+                    depth += 1
+                elif value.strip().upper() == component:
+                    depth = 0
+            elif depth is not None and name == "END":
+                if depth == 0:
+                    out.extend(f"{key}:{val}" for key, val in pending.items())
+                    depth = False
+                else:
+                    depth -= 1
+            elif depth == 0 and name in pending:
+                out.append(f"{name}:{pending.pop(name)}")
+                continue
+        out.append(line)
+    if depth is not False:
+        return None
+    return "\r\n".join(out) + "\r\n"
+
+
+def ical_text(value) -> str:
+    # Escape a TEXT value in a single pass
+    return str(value).replace("\r\n", "\n").translate(_ICAL_ESCAPE)
+
+
+def ical_date_line(name: str, value: date | datetime) -> str:
+    """
+    Content line of a DATE or DATE-TIME property. Datetimes are written in UTC,
+    naive ones being taken as local time, like caldav does.
+    """
+    if isinstance(value, datetime):
+        return f"{name}:{value.astimezone(timezone.utc):%Y%m%dT%H%M%SZ}"
+    return f"{name};VALUE=DATE:{value:%Y%m%d}"
+
+
+def vcalendar(component: str, uid: str, lines: Sequence[str]) -> str:
+    """
+    VCALENDAR text holding one `component` (e.g. "VTODO") with this UID, a DTSTAMP
+    of now, and the given (already escaped) content lines.
+    """
+    return "\r\n".join(
         [
-            "curl",
-            "https://n8n.auragan.fr/webhook/sync_calendars",
-            "-u",
-            f"{n8n_id}:{n8n_pass}",
-        ],
-        capture_output=True,
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Radicalized//EN",
+            f"BEGIN:{component}",
+            f"UID:{uid}",
+            ical_date_line("DTSTAMP", datetime.now(timezone.utc).replace(microsecond=0)),
+            *lines,
+            f"END:{component}",
+            "END:VCALENDAR",
+            "",
+        ]
     )
-    print("Synced local Caldav with Google Calendar successfully")
+
@@ -2,6 +2,17 @@ import caldav
 from vobject import vCard
 from vobject.vcard import Name, Address
 
+from managers.contact_manager import _iter_responses
+
+_PROPFIND_CHILDREN = b"""<?xml version="1.0" encoding="utf-8" ?>
+<d:propfind xmlns:d="DAV:">
+  <d:prop><d:resourcetype/><d:displayname/></d:prop>
+</d:propfind>
+"""
+
+# Components update_item() knows how to edit, in lookup order
+_COMPONENT_KINDS = ("vevent", "vtodo", "vjournal", "vcard")
+
 
 class RadicaleManager:
     def __init__(self, url, username, password):
@@ -61,8 +72,75 @@ class RadicaleManager:
 
     # --- GENERAL UTILITIES ---
     def list_all(self):
-        """Lists everything in this specific collection"""
-        return self.collection.children()
+        """
+        Lists everything in this specific collection, as (url, resource_types, display_name)
+        tuples like collection.children(). The multistatus is stream-parsed one
+        <response> at a time, while it downloads, instead of being loaded as a whole tree.
+        """
+        base = self.collection.url
+        base_path = base.path.rstrip("/")
+        children = []
+        # Through the client's pooled session, with the same hardened parser as contacts
+        with self._propfind_stream(str(base)) as r:
+            r.raise_for_status()
+            # niquests hands out the raw stream still gzip-encoded
+            r.raw.decode_content = True
+            for resp in _iter_responses(r.raw):
+                href = resp.findtext("{DAV:}href")
+                types = [el.tag for el in resp.iterfind(".//{DAV:}resourcetype/*")]
+                name = resp.findtext(".//{DAV:}displayname")
+
+                if not href:
+                    continue
+                url = base.join(href)
+                # The collection itself is part of its own Depth: 1 listing
+                if url.path.rstrip("/") == base_path:
+                    continue
+                children.append((url, types, name))
+
+        return children
+
+    def _propfind_stream(self, url):
+        """
+        Streamed Depth: 1 PROPFIND of `url`, authenticated like the DAVClient's own
+        requests (Basic, Digest or Bearer). The client only picks its auth from a
+        server's 401 challenge, so a first 401 builds it and the request is sent again.
+        """
+        client = self.client
+
+        def send():
+            return client.session.request(
+                "PROPFIND",
+                url,
+                auth=client.auth,
+                headers={"Depth": "1", "Content-Type": "application/xml"},
+                data=_PROPFIND_CHILDREN,
+                timeout=20,
+                stream=True,
+            )
+
+        r = send()
+        challenge = r.headers.get("WWW-Authenticate")
+        if r.status_code == 401 and challenge and not client.auth:
+            r.close()
+            client.build_auth_object(client.extract_auth_types(challenge))
+            r = send()
+        return r
+
+    def find_by_summary(self, title):
+        """
+        Return the first item whose SUMMARY is exactly `title`, or None.
+        Filtering happens server-side (calendar-query REPORT with a SUMMARY text-match),
+        so only candidate items are transferred instead of the whole collection.
+        """
+        for comp in ("event", "todo", "journal"):
+            # text-match is a substring match: confirm the exact title client-side
+            for item in self.collection.search(summary=title, **{comp: True}):
+                comp_obj = getattr(item.vobject_instance, "v" + comp, None)
+                if comp_obj is not None and comp_obj.contents.get("summary"):
+                    if comp_obj.contents["summary"][0].value == title:
+                        return item
+        return None
 
     def delete_item(self, item):
         """Deletes any object (Event, Task, or Contact)"""
@@ -76,23 +154,25 @@ class RadicaleManager:
         """
         # Get the component (vevent, vtodo, vjournal, or vcard)
         # iCal objects use 'instance.vevent', Contacts use 'instance.vcard'
-        if hasattr(item.vobject_instance, "vevent"):
-            comp = item.vobject_instance.vevent
-        elif hasattr(item.vobject_instance, "vtodo"):
-            comp = item.vobject_instance.vtodo
-        elif hasattr(item.vobject_instance, "vjournal"):
-            comp = item.vobject_instance.vjournal
-        elif hasattr(item.vobject_instance, "vcard"):
-            comp = item.vobject_instance.vcard
+        contents = item.vobject_instance.contents
+        for kind in _COMPONENT_KINDS:
+            components = contents.get(kind)
+            if components:
+                comp = components[0]
+                break
         else:
             raise ValueError("Unknown item type")
 
-        # Apply updates dynamically
+        # Apply updates dynamically; vobject keys lines by lowercase dashed name
+        # (percent_complete or PERCENT-COMPLETE -> percent-complete)
+        lines = comp.contents
         for key, value in updates.items():
-            if hasattr(comp, key):
-                getattr(comp, key).value = value
+            name = key.replace("_", "-").lower()
+            existing = lines.get(name)
+            if existing:
+                existing[0].value = value
             else:
-                comp.add(key).value = value
+                comp.add(name).value = value
 
         item.save()
         return item
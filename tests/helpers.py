@@ -0,0 +1,12 @@
+from types import SimpleNamespace
+
+import vobject
+
+
+def calendar_item(component: str, summary: str, url: str):
+    """Stand-in for a caldav object: its url and a one-component vobject_instance."""
+    cal = vobject.iCalendar()
+    comp = cal.add(component)
+    comp.add("uid").value = url
+    comp.add("summary").value = summary
+    return SimpleNamespace(url=url, vobject_instance=cal)
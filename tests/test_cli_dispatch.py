@@ -0,0 +1,104 @@
+import contextlib
+import io
+import unittest
+
+import cli
+
+PROG = "cli.py"
+
+
+def _argparse(argv: list[str]) -> dict:
+    args = cli.build_parser([PROG, *argv]).parse_args(argv)
+    return {k: v for k, v in vars(args).items() if not k.startswith("_")}
+
+
+def _fast(argv: list[str]) -> dict:
+    return vars(cli.fast_dispatch([PROG, *argv]))
+
+
+class FastDispatchTest(unittest.TestCase):
+    """fast_dispatch() must agree with argparse, or refuse so that argparse takes over."""
+
+    AGREE = [
+        ["event", "list"],
+        ["contact", "list"],
+        ["task", "get", "--uid", "abc"],
+        ["journal", "delete", "--uid", "abc"],
+        ["event", "add", "--title", "Lunch", "--start", "2026-01-02 12:00",
+         "--end", "2026-01-02 13:00"],
+        ["event", "add", "--end", "2026-01-02 13:00", "--title", "T", "--start", "2026-01-02 12:00",
+         "--invite", "a@example.org", "b@example.org"],
+        ["event", "update", "--uid", "u", "--new-title", "New", "--invite", "a@example.org"],
+        ["task", "add", "--title", "Write tests"],
+        ["task", "add", "--title", "T", "--priority", "1", "--percent-complete", "50",
+         "--categories", "work", "urgent", "--due", "2026-01-02"],
+        ["task", "update", "--uid", "u", "--new-priority", "3", "--new-status", "COMPLETED",
+         "--new-categories", "home"],
+        ["journal", "add", "--title", "Today"],
+        ["journal", "add", "--title", "Today", "--desc", "Nothing much"],
+        ["contact", "add", "--name", "Ann Lee", "--email", "ann@example.org", "--github", "ann"],
+        ["contact", "update", "--uid", "u", "--new-note", "hi", "--new-org", "ACME"],
+        # The same option twice: the last one wins, as in argparse
+        ["task", "add", "--title", "first", "--title", "second"],
+    ]
+
+    # Forms fast_dispatch() leaves to argparse
+    FALLBACK = [
+        ["task"],
+        ["-h"],
+        ["task", "-h"],
+        ["task", "add", "-h"],
+        ["task", "add", "--help"],
+        ["unknown", "list"],
+        ["task", "frobnicate"],
+        ["task", "add"],  # missing required --title
+        ["task", "add", "--title"],  # missing value
+        ["task", "add", "--title=Inline"],
+        ["task", "add", "--tit", "Abbreviated"],
+        ["task", "add", "--title", "T", "--priority", "high"],
+        ["task", "add", "--title", "T", "--priority", "-1"],
+        ["task", "add", "--title", "T", "--categories"],
+        ["task", "add", "--title", "T", "--bogus", "x"],
+        ["event", "list", "extra"],
+    ]
+
+    def test_agrees_with_argparse(self):
+        for argv in self.AGREE:
+            with self.subTest(argv=argv):
+                self.assertEqual(_fast(argv), _argparse(argv))
+
+    def test_refuses_what_it_does_not_fully_understand(self):
+        for argv in self.FALLBACK:
+            with self.subTest(argv=argv):
+                with self.assertRaises(ValueError):
+                    cli.fast_dispatch([PROG, *argv])
+
+    def test_cached_parse_falls_back_to_argparse(self):
+        for argv, expected in (
+            (["task", "add", "--title=Inline"], {"title": "Inline"}),
+            (["task", "add", "--tit", "Abbreviated"], {"title": "Abbreviated"}),
+            (["task", "add", "--title", "T", "--priority", "-1"], {"priority": -1}),
+        ):
+            with self.subTest(argv=argv):
+                args = vars(cli._cached_parse(tuple(argv)))
+                self.assertEqual({k: args[k] for k in expected}, expected)
+
+    def test_argparse_errors_are_kept(self):
+        for argv in (["task", "add"], ["task", "add", "--title", "T", "--priority", "high"]):
+            with self.subTest(argv=argv):
+                with contextlib.redirect_stderr(io.StringIO()) as err:
+                    with self.assertRaises(SystemExit) as exit_:
+                        cli._cached_parse(tuple(argv))
+                self.assertEqual(exit_.exception.code, 2)
+                self.assertIn("error:", err.getvalue())
+
+    def test_help_lists_every_action(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            with self.assertRaises(SystemExit):
+                cli._cached_parse(("task", "-h"))
+        for action in cli.ACTIONS:
+            self.assertIn(action, out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import caldav
+
+from managers.manager import _pooled_adapter
+
+URL = "http://dav.example/cal/"
+
+
+class PooledAdapterTest(unittest.TestCase):
+    """_pooled_adapter() must only change the pool sizes and the retries."""
+
+    def setUp(self):
+        # Building a DAVClient doesn't touch the network
+        self.session = caldav.DAVClient(URL, username="u", password="p").session
+
+    def test_keeps_the_session_settings(self):
+        for prefix in ("https://", "http://"):
+            with self.subTest(prefix):
+                original = self.session.get_adapter(prefix)
+                pooled = _pooled_adapter(original)
+                self.assertIs(type(pooled), type(original))
+                self.assertEqual((pooled._pool_connections, pooled._pool_maxsize), (4, 16))
+                for name, value in vars(original).items():
+                    if name in ("_pool_connections", "_pool_maxsize", "max_retries"):
+                        continue
+                    if name.startswith("_") and not name.endswith("_cache"):
+                        self.assertEqual(getattr(pooled, name), value, name)
+
+    def test_retries_reads_only(self):
+        retries = _pooled_adapter(self.session.get_adapter("https://")).max_retries
+        self.assertEqual(retries.total, 2)
+        for method in ("GET", "HEAD", "OPTIONS", "PROPFIND"):
+            self.assertTrue(retries._is_method_retryable(method), method)
+        for method in ("PUT", "DELETE", "POST", "REPORT", "PROPPATCH"):
+            self.assertFalse(retries._is_method_retryable(method), method)
+
+
+if __name__ == "__main__":
+    unittest.main()
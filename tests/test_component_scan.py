@@ -0,0 +1,157 @@
+import unittest
+
+import vobject
+from vobject.icalendar import stringToTextValues
+
+from managers.utils import patch_component, scan_component
+
+NAMES = frozenset(("summary", "uid", "status", "description", "due", "percent-complete"))
+
+
+def _calendar(*lines: str) -> str:
+    lines = ("BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//test//EN", *lines, "END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n"
+
+
+TODO = _calendar(
+    "BEGIN:VTIMEZONE",
+    "TZID:Europe/Paris",
+    "BEGIN:STANDARD",
+    "DTSTART:19701025T030000",
+    "TZOFFSETFROM:+0200",
+    "TZOFFSETTO:+0100",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+    "BEGIN:VTODO",
+    "UID:todo-1",
+    r"SUMMARY:Buy milk\, eggs\; bread",
+    "DUE;VALUE=DATE:20260301",
+    "BEGIN:VALARM",
+    "ACTION:DISPLAY",
+    "DESCRIPTION:alarm text",
+    "SUMMARY:alarm summary",
+    "TRIGGER:-PT15M",
+    "END:VALARM",
+    "DESCRIPTION:a description long enough that it",
+    "  is folded onto a second line",
+    "percent-complete:40",
+    "STATUS:NEEDS-ACTION",
+    "STATUS:IN-PROCESS",
+    "END:VTODO",
+)
+
+
+def _vobject_values(ics: str, component: str) -> dict[str, str]:
+    comp = vobject.readOne(ics, transform=False).contents[component.lower()][0]
+    return {k: lines[0].value for k, lines in comp.contents.items() if k in NAMES}
+
+
+class ScanComponentTest(unittest.TestCase):
+    """scan_component() must read the same first values as vobject."""
+
+    def _assert_matches_vobject(self, ics: str, component: str = "VTODO"):
+        raw = scan_component(ics, component, NAMES)
+        self.assertIsNotNone(raw)
+        # scan_component() returns raw TEXT; vobject has already unescaped it
+        decoded = {k: stringToTextValues(v)[0] for k, v in raw.items()}
+        self.assertEqual(decoded, _vobject_values(ics, component))
+
+    def test_matches_vobject(self):
+        self._assert_matches_vobject(TODO)
+
+    def test_skips_nested_components(self):
+        raw = scan_component(TODO, "VTODO", NAMES)
+        self.assertEqual(raw["summary"], r"Buy milk\, eggs\; bread")
+        self.assertTrue(raw["description"].startswith("a description"))
+
+    def test_unfolds_and_keeps_first_occurrence(self):
+        raw = scan_component(TODO, "VTODO", NAMES)
+        self.assertEqual(
+            raw["description"], "a description long enough that it is folded onto a second line"
+        )
+        self.assertEqual(raw["status"], "NEEDS-ACTION")
+
+    def test_lf_only_text(self):
+        self._assert_matches_vobject(TODO.replace("\r\n", "\n"))
+
+    def test_picks_the_requested_component(self):
+        ics = _calendar(
+            "BEGIN:VEVENT", "UID:event-1", "SUMMARY:event", "END:VEVENT",
+            "BEGIN:VTODO", "UID:todo-2", "SUMMARY:todo", "END:VTODO",
+        )
+        self.assertEqual(scan_component(ics, "VTODO", NAMES), {"uid": "todo-2", "summary": "todo"})
+
+    def test_missing_component(self):
+        ics = _calendar("BEGIN:VEVENT", "UID:event-1", "END:VEVENT")
+        self.assertIsNone(scan_component(ics, "VTODO", NAMES))
+
+    def test_bails_out_on_quoted_parameters(self):
+        ics = _calendar("BEGIN:VTODO", "UID:q", 'SUMMARY;X-LABEL="a:b":text', "END:VTODO")
+        self.assertIsNone(scan_component(ics, "VTODO", NAMES))
+
+    def test_quoted_parameters_of_nested_components_are_ignored(self):
+        ics = _calendar(
+            "BEGIN:VTODO", "UID:q2", "SUMMARY:top",
+            "BEGIN:VALARM", 'DESCRIPTION;X-LABEL="a:b":alarm', "END:VALARM",
+            "END:VTODO",
+        )
+        self.assertEqual(scan_component(ics, "VTODO", NAMES), {"uid": "q2", "summary": "top"})
+
+    def test_matches_whole_property_names_only(self):
+        ics = _calendar(
+            "BEGIN:VTODO", "UID:n", "X-SUMMARY:not this", "SUMMARYX:nor this", "SUMMARY:this",
+            "END:VTODO",
+        )
+        self.assertEqual(scan_component(ics, "VTODO", NAMES), {"uid": "n", "summary": "this"})
+
+    def test_property_names_are_case_insensitive(self):
+        raw = scan_component(TODO, "VTODO", NAMES)
+        self.assertEqual(raw["percent-complete"], "40")
+
+
+class PatchComponentTest(unittest.TestCase):
+    """patch_component() output must read back in vobject with the patched values."""
+
+    def _patch(self, ics: str, updates: dict[str, str]):
+        patched = patch_component(ics, "VTODO", updates)
+        self.assertIsNotNone(patched)
+        self.assertNotRegex(patched, r"(?<!\r)\n")
+        return patched, vobject.readOne(patched)
+
+    def test_replaces_top_level_lines_only(self):
+        _, v = self._patch(TODO, {"DESCRIPTION": "new description", "STATUS": "COMPLETED"})
+        todo = v.vtodo
+        self.assertEqual(todo.description.value, "new description")
+        self.assertEqual([s.value for s in todo.status_list], ["COMPLETED", "IN-PROCESS"])
+        # The VALARM's own DESCRIPTION is left alone
+        self.assertEqual(todo.valarm.description.value, "alarm text")
+
+    def test_adds_missing_properties_before_the_component_end(self):
+        patched, v = self._patch(TODO, {"COMPLETED": "20260301T120000Z"})
+        self.assertEqual(v.vtodo.completed.value.year, 2026)
+        self.assertNotIn("completed", v.vtodo.valarm.contents)
+        self.assertLess(patched.index("COMPLETED:"), patched.index("END:VTODO"))
+        self.assertGreater(patched.index("COMPLETED:"), patched.index("END:VALARM"))
+
+    def test_keeps_other_components(self):
+        _, v = self._patch(TODO, {"SUMMARY": "renamed"})
+        self.assertEqual(v.vtodo.summary.value, "renamed")
+        self.assertEqual(v.vtimezone.tzid.value, "Europe/Paris")
+        self.assertEqual(
+            _vobject_values(patch_component(TODO, "VTODO", {}), "VTODO"),
+            _vobject_values(TODO, "VTODO"),
+        )
+
+    def test_roundtrips_through_scan_component(self):
+        patched, _ = self._patch(TODO, {"SUMMARY": r"a\, b", "PERCENT-COMPLETE": "100"})
+        raw = scan_component(patched, "VTODO", NAMES)
+        self.assertEqual(raw["summary"], r"a\, b")
+        self.assertEqual(raw["percent-complete"], "100")
+
+    def test_missing_component(self):
+        ics = _calendar("BEGIN:VEVENT", "UID:event-1", "END:VEVENT")
+        self.assertIsNone(patch_component(ics, "VTODO", {"SUMMARY": "x"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import unittest
+
+import vobject
+
+from managers.contact_manager import (
+    ContactManager,
+    _parse_vcard_fast,
+    _patch_vcard_text,
+)
+
+URL = "http://dav.example/ab/card.vcf"
+
+
+def _card(*lines: str) -> str:
+    return "\r\n".join(("BEGIN:VCARD", "VERSION:3.0", *lines, "END:VCARD")) + "\r\n"
+
+
+def _with_vobject(text: str):
+    return ContactManager._contact_from_vobject(URL, vobject.readOne(text))
+
+
+def _with_fast_path(text: str):
+    fields = _parse_vcard_fast(text)
+    assert fields is not None, "fast path unexpectedly bailed out"
+    return ContactManager._contact_from_fields(URL, fields)
+
+
+class ParseVcardFastTest(unittest.TestCase):
+    """_parse_vcard_fast() must build the same Contact as vobject does."""
+
+    CARDS = {
+        "plain": _card(
+            "UID:abc-1",
+            "FN:Ann Lee",
+            "N:Lee;Ann;;;",
+            "EMAIL;TYPE=INTERNET:ann@example.org",
+            "TEL;TYPE=CELL:+33 6 12 34 56 78",
+            "BDAY:1990-02-03",
+            "URL:https://example.org",
+        ),
+        "folded lines": _card(
+            "UID:abc-2",
+            "FN:Someone With A Very Long Name That Gets",
+            "  Folded",
+            "NOTE:first part of the note and",
+            "\t the second part",
+        ),
+        "LF only": _card("UID:abc-3", "FN:Bare LF").replace("\r\n", "\n"),
+        "escaped text": _card(
+            "UID:abc-4",
+            r"FN:Bob\, Jr\; X",
+            r"NOTE:line one\nline two\\ backslash",
+            r"TITLE:Chief\, Officer",
+        ),
+        "unescaped comma": _card("UID:abc-5", "FN:Carl", "NOTE:first,second"),
+        "org units": _card("UID:abc-6", "FN:Dee", r"ORG:ACME\, Inc;R&D;Lab 2"),
+        "address": _card("UID:abc-7", "FN:Eve", "ADR;TYPE=HOME:;;1 Main St;Paris;;75001;FR"),
+        "repeated and grouped": _card(
+            "UID:abc-8",
+            "FN:Finn",
+            "item1.EMAIL;TYPE=INTERNET:first@example.org",
+            "item1.X-ABLABEL:work",
+            "EMAIL:second@example.org",
+            "TEL:111",
+            "TEL:222",
+        ),
+        "lowercase names": _card("uid:abc-9", "fn:Gil", "email:gil@example.org"),
+        "missing fields": _card("UID:abc-10"),
+    }
+
+    def test_matches_vobject(self):
+        for label, text in self.CARDS.items():
+            with self.subTest(label):
+                self.assertEqual(_with_fast_path(text), _with_vobject(text))
+
+    def test_bails_out_on_quoted_parameters(self):
+        text = _card('UID:q-1', 'FN;X-LABEL="a:b;c":Quoted')
+        self.assertIsNone(_parse_vcard_fast(text))
+        # ... and the text entry point falls back to vobject
+        self.assertEqual(ContactManager._contact_from_text(URL, text).name, "Quoted")
+
+    def test_bails_out_on_encoding_parameter(self):
+        text = _card("UID:e-1", "FN:Enc", "NOTE;ENCODING=QUOTED-PRINTABLE:caf=C3=A9")
+        self.assertIsNone(_parse_vcard_fast(text))
+
+    def test_ignores_parameters_of_other_properties(self):
+        # Only the properties a Contact is built from make the fast path bail out
+        text = _card("UID:o-1", "FN:Other", 'X-FOO;LABEL="a:b":bar')
+        self.assertEqual(_with_fast_path(text), _with_vobject(text))
+
+
+class PatchVcardTextTest(unittest.TestCase):
+    """_patch_vcard_text() must yield a card vobject reads back with the new values."""
+
+    def _patch(self, text: str, updates: dict[str, str]):
+        patched = _patch_vcard_text(text, updates)
+        self.assertTrue(patched.endswith("\r\n"))
+        self.assertNotRegex(patched, r"(?<!\r)\n")
+        return patched, vobject.readOne(patched)
+
+    def test_replaces_existing_and_keeps_the_rest(self):
+        text = _card(
+            "UID:p-1",
+            "FN:Old Name",
+            "EMAIL;TYPE=INTERNET:old@example.org",
+            "TEL:123",
+            "X-CUSTOM;FOO=bar:kept as is",
+        )
+        patched, v = self._patch(text, {"FN": "New Name", "EMAIL": "new@example.org"})
+
+        self.assertEqual(v.fn.value, "New Name")
+        self.assertEqual(v.email.value, "new@example.org")
+        self.assertEqual(v.email.params, {"TYPE": ["INTERNET"]})
+        self.assertEqual(v.tel.value, "123")
+        self.assertIn("X-CUSTOM;FOO=bar:kept as is\r\n", patched)
+
+    def test_only_first_property_of_a_name_is_replaced(self):
+        text = _card("UID:p-2", "FN:X", "EMAIL:a@example.org", "EMAIL:b@example.org")
+        _, v = self._patch(text, {"EMAIL": "c@example.org"})
+        self.assertEqual([e.value for e in v.email_list], ["c@example.org", "b@example.org"])
+
+    def test_adds_missing_properties_before_end(self):
+        text = _card("UID:p-3", "FN:X")
+        patched, v = self._patch(text, {"NOTE": r"hello\, world", "TEL": "555"})
+        self.assertEqual(v.note.value, "hello, world")
+        self.assertEqual(v.tel.value, "555")
+        self.assertTrue(patched.rstrip("\r\n").endswith("END:VCARD"))
+
+    def test_folded_property_is_replaced_whole(self):
+        text = _card("UID:p-4", "FN:X", "NOTE:a note that was", "  folded over two lines")
+        _, v = self._patch(text, {"NOTE": "short"})
+        self.assertEqual(v.note.value, "short")
+
+    def test_keeps_group_and_quoted_parameters(self):
+        text = _card("UID:p-5", "FN:X", 'item1.EMAIL;X-LABEL="home: main":old@example.org')
+        _, v = self._patch(text, {"EMAIL": "new@example.org"})
+        self.assertEqual(v.email.value, "new@example.org")
+        self.assertEqual(v.email.group, "item1")
+        self.assertEqual(v.email.params["X-LABEL"], ["home: main"])
+
+    def test_drops_the_old_value_encoding(self):
+        text = _card(
+            "UID:p-7",
+            "FN;CHARSET=UTF-8:X",
+            "NOTE;ENCODING=QUOTED-PRINTABLE;CHARSET=UTF-8;LANGUAGE=fr:caf=C3=A9",
+            "TITLE;QUOTED-PRINTABLE:old",
+            'ORG;X-LABEL="a;b";ENCODING=b:T2xk',
+            "PHOTO;ENCODING=b;TYPE=JPEG:AAAA",
+        )
+        patched, v = self._patch(
+            text, {"NOTE": "plain", "TITLE": "Chief", "ORG": "New Corp", "FN": "Y"}
+        )
+        self.assertIn("NOTE;LANGUAGE=fr:plain\r\n", patched)
+        self.assertIn("TITLE:Chief\r\n", patched)
+        self.assertIn('ORG;X-LABEL="a;b":New Corp\r\n', patched)
+        self.assertIn("FN:Y\r\n", patched)
+        self.assertEqual(v.note.value, "plain")
+        self.assertEqual(v.org.value, ["New Corp"])
+        # Lines that aren't rewritten keep their encoding
+        self.assertIn("PHOTO;ENCODING=b;TYPE=JPEG:AAAA\r\n", patched)
+        self.assertEqual(ContactManager._contact_from_text(URL, patched), _with_vobject(patched))
+
+    def test_matches_the_fast_parser(self):
+        text = _card("UID:p-6", "FN:Old", "ORG:Old Corp")
+        patched, v = self._patch(text, {"FN": "New", "ORG": r"New\, Corp"})
+        self.assertEqual(_with_fast_path(patched), _with_vobject(patched))
+
+
+if __name__ == "__main__":
+    unittest.main()
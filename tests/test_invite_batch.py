@@ -0,0 +1,131 @@
+import os
+import unittest
+from unittest import mock
+
+from managers import utils
+from managers.utils import invite_attendees_batch
+
+
+class _Request:
+    def __init__(self, method: str, **kwargs):
+        self.method = method
+        self.kwargs = kwargs
+
+
+class _Events:
+    def list(self, **kwargs):
+        return _Request("list", **kwargs)
+
+    def patch(self, **kwargs):
+        return _Request("patch", **kwargs)
+
+
+class _Batch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batches.append([req.method for _, req in self.requests])
+        for request_id, request in self.requests:
+            try:
+                response = self.service.answer(request)
+            except Exception as e:
+                self.callback(request_id, None, e)
+            else:
+                self.callback(request_id, response, None)
+
+
+class FakeCalendarService:
+    """Calendar v3 service stub: `events` maps an iCalUID to its Google events."""
+
+    def __init__(self, events: dict[str, list[dict]]):
+        self.events_by_uid = events
+        self.batches: list[list[str]] = []
+
+    def events(self):
+        return _Events()
+
+    def new_batch_http_request(self, callback):
+        return _Batch(self, callback)
+
+    def answer(self, request: _Request):
+        if request.method == "list":
+            uid = request.kwargs["iCalUID"]
+            if uid == "broken":
+                raise RuntimeError("HTTP 500")
+            return {"items": self.events_by_uid.get(uid, [])}
+        body = request.kwargs["body"]
+        return {"id": request.kwargs["eventId"], "attendees": body["attendees"]}
+
+
+@mock.patch.dict(os.environ, {"GOOGLE_CALENDAR_ID": "cal@example.org"})
+class InviteAttendeesBatchTest(unittest.TestCase):
+    def test_looks_up_then_patches_in_two_batches(self):
+        service = FakeCalendarService(
+            {
+                "a": [{"id": "g-a", "attendees": [{"email": "Old@example.org"}]}],
+                "b": [{"id": "g-b"}],
+            }
+        )
+        results = invite_attendees_batch(
+            service, [("a", ["old@example.org", "new@example.org"]), ("b", "x@example.org")]
+        )
+
+        self.assertEqual(service.batches, [["list", "list"], ["patch", "patch"]])
+        attendees = [{"email": "Old@example.org"}, {"email": "new@example.org"}]
+        self.assertEqual(results["a"], {"id": "g-a", "attendees": attendees})
+        self.assertEqual(results["b"], {"id": "g-b", "attendees": [{"email": "x@example.org"}]})
+
+    def test_merges_emails_of_a_uid_listed_twice(self):
+        service = FakeCalendarService({"a": [{"id": "g-a"}]})
+        results = invite_attendees_batch(
+            service, [("a", "one@example.org"), ("a", ["ONE@example.org", "two@example.org"])]
+        )
+        self.assertEqual(service.batches, [["list"], ["patch"]])
+        self.assertEqual(
+            [a["email"] for a in results["a"]["attendees"]], ["one@example.org", "two@example.org"]
+        )
+
+    def test_maps_errors_to_their_uid(self):
+        service = FakeCalendarService(
+            {"ok": [{"id": "g-ok"}], "dup": [{"id": "g-1"}, {"id": "g-2"}]}
+        )
+        results = invite_attendees_batch(
+            service,
+            [
+                ("ok", "a@example.org"),
+                ("missing", "a@example.org"),
+                ("dup", "a@example.org"),
+                ("broken", "a@example.org"),
+                ("nobody", ["", "  "]),
+            ],
+        )
+
+        self.assertEqual(results["ok"]["id"], "g-ok")
+        self.assertIsInstance(results["missing"], ValueError)
+        self.assertIn("No Google event", str(results["missing"]))
+        self.assertIsInstance(results["dup"], ValueError)
+        self.assertIn("Multiple Google events", str(results["dup"]))
+        self.assertIsInstance(results["broken"], RuntimeError)
+        self.assertIsInstance(results["nobody"], ValueError)
+        # Only the lookups that went through get a patch
+        self.assertEqual(service.batches, [["list"] * 4, ["patch"]])
+
+    def test_splits_batches_at_the_google_limit(self):
+        uids = [f"uid-{i}" for i in range(utils._BATCH_LIMIT + 5)]
+        service = FakeCalendarService({uid: [{"id": f"g-{uid}"}] for uid in uids})
+        results = invite_attendees_batch(service, [(uid, "a@example.org") for uid in uids])
+
+        limit = utils._BATCH_LIMIT
+        self.assertEqual([len(batch) for batch in service.batches], [limit, 5, limit, 5])
+        self.assertEqual(set(results), set(uids))
+        self.assertTrue(all(isinstance(r, dict) for r in results.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import io
+import unittest
+from types import SimpleNamespace
+
+from caldav.davclient import requests as dav_http
+
+from radicale_manager import RadicaleManager
+from tests.helpers import calendar_item
+
+# The HTTP stack caldav runs on (niquests, or requests as a fallback)
+HTTPDigestAuth = dav_http.auth.HTTPDigestAuth
+
+URL = "http://dav.example/u/cal/"
+
+MULTISTATUS = b"""<?xml version="1.0" encoding="utf-8"?>
+<d:multistatus xmlns:d="DAV:">
+  <d:response><d:href>/u/cal/</d:href><d:propstat><d:prop>
+    <d:resourcetype><d:collection/></d:resourcetype></d:prop></d:propstat></d:response>
+  <d:response><d:href>/u/cal/a.ics</d:href><d:propstat><d:prop>
+    <d:resourcetype/><d:displayname>A</d:displayname></d:prop></d:propstat></d:response>
+</d:multistatus>
+"""
+
+
+class FindBySummaryTest(unittest.TestCase):
+    """RadicaleManager.find_by_summary() over a stubbed collection.search()."""
+
+    def _manager(self, by_component: dict[str, list]):
+        searches = []
+
+        def search(summary, **comp):
+            (kind,) = comp
+            searches.append((kind, summary))
+            return by_component.get(kind, [])
+
+        mgr = RadicaleManager.__new__(RadicaleManager)
+        mgr.collection = SimpleNamespace(search=search)
+        return mgr, searches
+
+    def test_keeps_only_exact_titles(self):
+        # The server's text-match is a substring match
+        mgr, _ = self._manager(
+            {"event": [calendar_item("vevent", "Lunch with Ann", "e1"), calendar_item("vevent", "Lunch", "e2")]}
+        )
+        self.assertEqual(mgr.find_by_summary("Lunch").url, "e2")
+
+    def test_first_match_in_search_order(self):
+        mgr, searches = self._manager(
+            {
+                "event": [calendar_item("vevent", "Other", "e1")],
+                "todo": [calendar_item("vtodo", "Report", "t1"), calendar_item("vtodo", "Report", "t2")],
+                "journal": [calendar_item("vjournal", "Report", "j1")],
+            }
+        )
+        self.assertEqual(mgr.find_by_summary("Report").url, "t1")
+        # Journals are never searched once a task matched
+        self.assertEqual(searches, [("event", "Report"), ("todo", "Report")])
+
+    def test_ignores_items_of_another_component(self):
+        mgr, _ = self._manager({"event": [calendar_item("vtodo", "Report", "t1")]})
+        self.assertIsNone(mgr.find_by_summary("Report"))
+
+
+class UpdateItemTest(unittest.TestCase):
+    """update_item() edits the existing line of a property whatever the key's case."""
+
+    def setUp(self):
+        self.item = calendar_item("vtodo", "Old", "t1")
+        self.item.saved = 0
+        self.item.save = lambda: setattr(self.item, "saved", self.item.saved + 1)
+        self.mgr = RadicaleManager.__new__(RadicaleManager)
+
+    def test_keys_in_any_case(self):
+        for key in ("summary", "SUMMARY", "Summary"):
+            with self.subTest(key):
+                self.mgr.update_item(self.item, {key: f"New {key}"})
+                todo = self.item.vobject_instance.vtodo
+                self.assertEqual([s.value for s in todo.summary_list], [f"New {key}"])
+
+    def test_underscores_and_new_lines(self):
+        self.mgr.update_item(self.item, {"PERCENT_COMPLETE": "50", "percent-complete": "60"})
+        self.mgr.update_item(self.item, {"description": "added"})
+        todo = self.item.vobject_instance.vtodo
+        self.assertEqual([p.value for p in todo.contents["percent-complete"]], ["60"])
+        self.assertEqual(todo.description.value, "added")
+        self.assertEqual(self.item.saved, 2)
+
+
+class _Response:
+    def __init__(self, status_code: int, headers: dict, body: bytes = b""):
+        self.status_code = status_code
+        self.headers = headers
+        self.raw = io.BytesIO(body)
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ListAllTest(unittest.TestCase):
+    """list_all() authenticates its streamed PROPFIND like the DAVClient does."""
+
+    def _manager(self, responses: list):
+        sent = []
+
+        def request(method, url, **kwargs):
+            sent.append((method, url, kwargs["auth"]))
+            return responses.pop(0)
+
+        mgr = RadicaleManager(URL, "user", "secret")
+        mgr.client.session = SimpleNamespace(request=request)
+        return mgr, sent
+
+    def test_lists_children_without_the_collection(self):
+        mgr, _ = self._manager([_Response(207, {}, MULTISTATUS)])
+        ((url, types, name),) = mgr.list_all()
+        self.assertEqual(str(url), "http://dav.example/u/cal/a.ics")
+        self.assertEqual((types, name), ([], "A"))
+
+    def test_builds_the_auth_the_server_asks_for(self):
+        challenge = _Response(401, {"WWW-Authenticate": 'Digest realm="dav", nonce="n"'})
+        mgr, sent = self._manager([challenge, _Response(207, {}, MULTISTATUS)])
+        self.assertEqual(len(mgr.list_all()), 1)
+        self.assertTrue(challenge.closed)
+        self.assertIsNone(sent[0][2])
+        self.assertIsInstance(sent[1][2], HTTPDigestAuth)
+        self.assertIs(mgr.client.auth, sent[1][2])
+
+    def test_reuses_the_negotiated_auth(self):
+        mgr, sent = self._manager([_Response(207, {}, MULTISTATUS)])
+        mgr.client.auth = auth = HTTPDigestAuth("user", "secret")
+        mgr.list_all()
+        self.assertEqual(len(sent), 1)
+        self.assertIs(sent[0][2], auth)
+
+    def test_wrong_credentials_are_not_retried(self):
+        mgr, sent = self._manager([_Response(401, {"WWW-Authenticate": "Basic"})])
+        mgr.client.auth = HTTPDigestAuth("user", "wrong")
+        with self.assertRaises(RuntimeError):
+            mgr.list_all()
+        self.assertEqual(len(sent), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
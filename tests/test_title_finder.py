@@ -0,0 +1,68 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import utils
+from tests.helpers import calendar_item
+
+
+class FindCaldavItemByTitleTest(unittest.TestCase):
+    """utils.find_caldav_item_by_title() with a stubbed manager and sync-token."""
+
+    def setUp(self):
+        self.cache = Path(tempfile.mkdtemp())
+        patches = [
+            mock.patch.object(utils, "cache_dir", return_value=self.cache),
+            mock.patch.object(utils, "_collection_sync_token", side_effect=lambda mgr: self.token),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(utils._VOBJECT_CACHE.clear)
+        self.token = "token-1"
+        self.items = [
+            calendar_item("vevent", "Standup", "http://dav/cal/1.ics"),
+            calendar_item("vevent", "Standup meeting", "http://dav/cal/2.ics"),
+            calendar_item("vevent", "Standup", "http://dav/cal/3.ics"),
+        ]
+        self.mgr = mock.Mock(base="http://dav/cal/", client=None, calendar=None)
+        self.mgr.list.side_effect = lambda: self.items
+
+    def test_exact_title_first_in_listing_order(self):
+        self.assertIs(utils.find_caldav_item_by_title(self.mgr, "Standup"), self.items[0])
+        self.assertIs(utils.find_caldav_item_by_title(self.mgr, "Standup meeting"), self.items[1])
+        self.assertIsNone(utils.find_caldav_item_by_title(self.mgr, "standup"))
+
+    def test_index_hit_skips_the_listing(self):
+        utils.find_caldav_item_by_title(self.mgr, "Standup")
+        index = json.loads(utils._title_index_path(self.mgr).read_text())
+        self.assertEqual(index["titles"]["Standup"], "http://dav/cal/1.ics")
+
+        loaded = object()
+        with mock.patch.object(utils, "CalendarObjectResource") as resource:
+            resource.return_value.load.return_value = loaded
+            self.assertIs(utils.find_caldav_item_by_title(self.mgr, "Standup"), loaded)
+        resource.assert_called_once_with(client=None, url="http://dav/cal/1.ics", parent=None)
+        self.assertEqual(self.mgr.list.call_count, 1)
+
+    def test_new_sync_token_relists(self):
+        utils.find_caldav_item_by_title(self.mgr, "Standup")
+        self.token = "token-2"
+        self.items = [calendar_item("vevent", "Standup", "http://dav/cal/9.ics")]
+        with mock.patch.object(utils, "CalendarObjectResource") as resource:
+            found = utils.find_caldav_item_by_title(self.mgr, "Standup")
+        resource.assert_not_called()
+        self.assertEqual(found.url, "http://dav/cal/9.ics")
+
+    def test_no_sync_token_never_trusts_the_index(self):
+        self.token = None
+        utils.find_caldav_item_by_title(self.mgr, "Standup")
+        utils.find_caldav_item_by_title(self.mgr, "Standup")
+        self.assertEqual(self.mgr.list.call_count, 2)
+        self.assertFalse(utils._title_index_path(self.mgr).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+Compile the .env next to cli.py into _env_cache.py, a plain module holding the parsed
+values, so the CLI imports them (from cached bytecode) instead of parsing the .env.
+
+Run it again whenever the .env changes: fast_load_dotenv() ignores a module that was
+generated from an older .env.
+
+    python tools/compile_env.py [path/to/.env]
+"""
+import sys
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def main():
+    # The stamp must be computed exactly as fast_load_dotenv() checks it
+    sys.path.insert(0, str(ROOT))
+    from utils import _env_stamp
+
+    env_path = Path(sys.argv[1] if len(sys.argv) > 1 else ROOT / ".env").resolve()
+    if not env_path.exists():
+        print(f"Error: {env_path} not found.")
+        sys.exit(1)
+
+    env = {k: v for k, v in dotenv_values(env_path).items() if v is not None}
+
+    out = ROOT / "_env_cache.py"
+    # Holds credentials: keep it private to the user.
+    out.touch(mode=0o600, exist_ok=True)
+    out.write_text(
+        "# Generated by tools/compile_env.py, do not edit.\n"
+        f"SOURCE_STAMP = {_env_stamp(env_path)!r}\n"
+        f"ENV = {env!r}\n",
+        encoding="utf-8",
+    )
+    print(f"Wrote {len(env)} variables to {out}")
+
+
+if __name__ == "__main__":
+    main()
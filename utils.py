@@ -1,38 +1,70 @@
+import functools
 import hashlib
 import json
 import os
 import re
+import shutil
 import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Union, Sequence
+from xml.etree import ElementTree as ET
 
 import requests
-import vobject
+from caldav import CalendarObjectResource
+from dotenv import dotenv_values, find_dotenv
 
-from managers.calendar_manager import CalendarManager
-from managers.contact_manager import ContactManager
-from managers.journal_manager import JournalManager
-from managers.task_manager import TaskManager
+SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-import os
-import pickle
 
-SCOPES = ["https://www.googleapis.com/auth/calendar"]
+# Refresh the OAuth token this long before it expires rather than mid-request
+_TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
 
 
-def get_google_service():
-    base_dir = Path(__file__).resolve().parent
-    credentials_path = base_dir / "credentials.json"
-    token_path = base_dir / "token.pkl"
+def _token_path() -> Path:
+    return Path(__file__).resolve().parent / "token.json"
+
+
+def _save_token(creds):
+    # Atomic replace, so another process never reads a half-written token
+    token_path = _token_path()
+    tmp = token_path.with_suffix(".tmp")
+    tmp.write_text(creds.to_json(), encoding="utf-8")
+    os.replace(tmp, token_path)
 
-    creds = None
 
+def _load_token():
+    from google.oauth2.credentials import Credentials
+
+    token_path = _token_path()
     if token_path.exists():
-        with open(token_path, "rb") as f:
+        info = json.loads(token_path.read_text(encoding="utf-8"))
+        return Credentials.from_authorized_user_info(info, SCOPES)
+
+    # Tokens used to be pickled: migrate one left over from an older version
+    legacy_path = token_path.with_suffix(".pkl")
+    if legacy_path.exists():
+        import pickle
+
+        with open(legacy_path, "rb") as f:
             creds = pickle.load(f)
+        _save_token(creds)
+        legacy_path.unlink()
+        return creds
+
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _google_creds_and_service():
+    # The Google client libraries are only needed for events: import them here.
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from googleapiclient.discovery import build
+
+    credentials_path = Path(__file__).resolve().parent / "credentials.json"
+    creds = _load_token()
 
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
@@ -48,27 +80,189 @@ def get_google_service():
             )
             creds = flow.run_local_server(port=0)
 
-        with open(token_path, "wb") as f:
-            pickle.dump(creds, f)
+        _save_token(creds)
+
+    # Read the discovery document bundled with googleapiclient, never over the network
+    service = build(
+        "calendar",
+        "v3",
+        credentials=creds,
+        model=_google_json_model(),
+        static_discovery=True,
+    )
+    return creds, service
+
+
+def get_google_service():
+    """
+    The Calendar v3 service, built once per process.
+    The credentials are refreshed in place shortly before they expire; the service
+    reads them on every request, so it never has to be rebuilt.
+    """
+    creds, service = _google_creds_and_service()
+
+    # google-auth keeps expiry as a naive UTC datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    expiry = creds.expiry
+    if expiry and creds.refresh_token and now > expiry - _TOKEN_REFRESH_MARGIN:
+        from google.auth.transport.requests import Request
+
+        creds.refresh(Request())
+        _save_token(creds)
+
+    return service
+
+
+def _google_json_model():
+    """
+    googleapiclient's JSON model, decoding responses with orjson when it is installed.
+    """
+    from googleapiclient.model import JsonModel
+
+    try:
+        import orjson
+    except ImportError:
+        return JsonModel()
+
+    class OrjsonModel(JsonModel):
+        def deserialize(self, content):
+            try:
+                body = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # Let the stock model handle non-JSON bodies
+                return super().deserialize(content)
+            if self._data_wrapper and isinstance(body, dict) and "data" in body:
+                body = body["data"]
+            return body
+
+    return OrjsonModel()
+
+
+def _compiled_env(env_path: Path):
+    """
+    ENV from the _env_cache module written by tools/compile_env.py, provided it was
+    generated from this exact .env and the file hasn't changed since.
+    """
+    try:
+        from _env_cache import ENV, SOURCE_STAMP
+    except ImportError:
+        return None
+    if SOURCE_STAMP != _env_stamp(env_path):
+        return None
+    return ENV
+
+
+def _env_stamp(env_path: Path) -> dict:
+    """What identifies one exact version of the .env: any edit or restore changes it."""
+    st = env_path.stat()
+    return {
+        "source": str(env_path.resolve()),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+    }
+
+
+def fast_load_dotenv():
+    """
+    Drop-in for load_dotenv(): uses the module compiled by tools/compile_env.py when
+    it is up to date, otherwise the parsed values are cached as JSON next to the
+    .env file and reused for as long as the .env's path, mtime and size are unchanged.
+    Like load_dotenv(), variables already present in the environment win.
+    """
+    env_path = find_dotenv()
+    if not env_path:
+        return
+    env_path = Path(env_path)
+    cache_path = env_path.with_name(".env.cache.json")
+
+    env = _compiled_env(env_path)
+    stamp = None
+    if env is None:
+        try:
+            stamp = _env_stamp(env_path)
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("stamp") == stamp:
+                env = cached["env"]
+        except Exception:
+            env = None
+
+    if env is None:
+        env = {k: v for k, v in dotenv_values(env_path).items() if v is not None}
+        try:
+            # Holds credentials: keep it private to the user, and swap it in whole
+            tmp = cache_path.with_suffix(".tmp")
+            tmp.touch(mode=0o600, exist_ok=True)
+            tmp.write_text(json.dumps({"stamp": stamp, "env": env}), encoding="utf-8")
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+
+    for key, value in env.items():
+        os.environ.setdefault(key, value)
+
+
+_ENV: dict[str, str] | None = None
+
 
-    return build("calendar", "v3", credentials=creds)
+def _env_snapshot() -> dict[str, str]:
+    global _ENV
+    if _ENV is None:
+        # Snapshot lazily so variables loaded from .env by the caller are included.
+        _ENV = dict(os.environ)
+    return _ENV
 
 
 def get_env(var, default=None):
-    val = os.getenv(var)
+    val = _env_snapshot().get(var)
     if not val and default is None:
         print(f"Error: Environment variable {var} is not set.")
         sys.exit(1)
     return val or default
 
 
+def get_envs(*names) -> tuple[str, ...]:
+    """
+    Fetch several required variables at once, reporting every missing one together.
+    """
+    env = _env_snapshot()
+    missing = [name for name in names if not env.get(name)]
+    if missing:
+        print(f"Error: Environment variables {', '.join(missing)} are not set.")
+        sys.exit(1)
+    return tuple(env[name] for name in names)
+
+
+def parse_ymd_hm(s: str) -> datetime:
+    """
+    Parse the CLI's "YYYY-MM-DD HH:MM" format by slicing, which is much cheaper
+    than going through datetime.strptime().
+    """
+    if len(s) != 16 or s[4] != "-" or s[7] != "-" or s[10] != " " or s[13] != ":":
+        raise ValueError(f"time data {s!r} does not match format 'YYYY-MM-DD HH:MM'")
+    return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]))
+
+
+# Parsed vobject per item href, so an item scanned once (e.g. by the title finder)
+# isn't re-parsed when it is looked at again. Cleared on any mutation.
+_VOBJECT_CACHE: dict[str, object] = {}
+
+
+def _cached_vobject(item):
+    key = str(item.url)
+    v = _VOBJECT_CACHE.get(key)
+    if v is None:
+        v = item.vobject_instance
+        _VOBJECT_CACHE[key] = v
+    return v
+
+
 def extract_vobject(raw, user: str, password: str):
     """
     Return a vobject instance if available.
     If tuple is (url, props, None), fetch+cache URL and parse into vobject.
     """
     if hasattr(raw, "vobject_instance"):
-        return raw.vobject_instance
+        return _cached_vobject(raw)
 
     if isinstance(raw, tuple):
         # Common pattern: (url, props, data)
@@ -95,6 +289,14 @@ def extract_href(raw):
     return repr(raw)
 
 
+_DISPLAY_NAME_FIELDS = (
+    ("vevent", "summary"),
+    ("vtodo", "summary"),
+    ("vjournal", "summary"),
+    ("vcard", "fn"),
+)
+
+
 def extract_display_name(vobj):
     """
     Pull a human label from a vobject instance (event/task/journal/vcard).
@@ -102,31 +304,24 @@ def extract_display_name(vobj):
       - top-level VCARD (vobj.fn)
       - VCALENDAR with vevent/vtodo/vjournal (vobj.vevent / vobj.vtodo / vobj.vjournal)
       - nested shapes (rare) where vobj.vcard exists
+    Looks children up in .contents directly instead of probing with hasattr().
     """
-    if vobj is None:
+    contents = getattr(vobj, "contents", None)
+    if not contents:
         return None
 
     # VCARD usually comes back as top-level object with .fn
-    if hasattr(vobj, "fn"):
-        try:
-            return vobj.fn.value
-        except Exception:
-            pass
-
-    # Sometimes people wrap it (depends on caller)
-    if hasattr(vobj, "vcard") and hasattr(vobj.vcard, "fn"):
-        try:
-            return vobj.vcard.fn.value
-        except Exception:
-            pass
+    lines = contents.get("fn")
+    if lines:
+        return lines[0].value
 
-    # VCALENDAR objects
-    if hasattr(vobj, "vevent") and hasattr(vobj.vevent, "summary"):
-        return vobj.vevent.summary.value
-    if hasattr(vobj, "vtodo") and hasattr(vobj.vtodo, "summary"):
-        return vobj.vtodo.summary.value
-    if hasattr(vobj, "vjournal") and hasattr(vobj.vjournal, "summary"):
-        return vobj.vjournal.summary.value
+    for key, field in _DISPLAY_NAME_FIELDS:
+        components = contents.get(key)
+        if not components:
+            continue
+        lines = components[0].contents.get(field)
+        if lines:
+            return lines[0].value
 
     return None
 
@@ -138,25 +333,66 @@ def cache_dir() -> Path:
     return p
 
 
+def _cache_key(s: str) -> str:
+    # Filename key only, not a security boundary: BLAKE2b-128 is faster than SHA-1
+    return hashlib.blake2b(s.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
 def cache_paths(url: str):
-    h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    h = _cache_key(url)
     ext = ".vcf" if url.lower().endswith(".vcf") else ".ics"
     base = cache_dir() / h
     return base.with_suffix(ext), base.with_suffix(".json")
 
 
+# The cache's JSON files go through orjson when it is installed
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
 def load_cached(meta_path: Path):
     if not meta_path.exists():
         return {}
     try:
-        return json.loads(meta_path.read_text(encoding="utf-8"))
+        return _json_loads(meta_path.read_bytes())
     except Exception:
         return {}
 
 
-def fetch_and_cache(url: str, user: str, password: str) -> str:
+@functools.lru_cache(maxsize=None)
+def _http() -> requests.Session:
     """
-    Returns the item text (VCF/ICS), using cache when possible.
+    Process-wide session for this module's raw DAV requests, so that fetching many
+    items reuses pooled keep-alive connections instead of reconnecting each time.
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=2,
+        backoff_factor=0.1,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"PROPFIND"},
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _conditional_get(url: str, user: str, password: str):
+    """
+    Streamed GET of `url` with the validators of its on-disk copy.
+    Returns (response, meta, data_path, meta_path); close the response when done.
     """
     data_path, meta_path = cache_paths(url)
     meta = load_cached(meta_path)
@@ -167,49 +403,170 @@ def fetch_and_cache(url: str, user: str, password: str) -> str:
     if meta.get("last_modified"):
         headers["If-Modified-Since"] = meta["last_modified"]
 
-    r = requests.get(url, auth=(user, password), headers=headers, timeout=15)
+    r = _http().get(
+        url, auth=(user, password), headers=headers, stream=True, timeout=15
+    )
+    return r, meta, data_path, meta_path
 
-    if r.status_code == 304 and data_path.exists():
-        return data_path.read_text(encoding="utf-8", errors="replace")
 
+def _store(url: str, r, data_path: Path, meta_path: Path):
+    """
+    Stream the body of `r` to data_path, without holding it in memory, then record
+    its validators in meta_path.
+    """
     r.raise_for_status()
-    text = r.text
+    r.raw.decode_content = True
+
+    # Write next to the cached copy and swap, so an interrupted download never
+    # leaves a truncated file behind the previous ETag
+    tmp = data_path.with_suffix(".part")
+    with tmp.open("wb") as f:
+        shutil.copyfileobj(r.raw, f, length=64 * 1024)
+    os.replace(tmp, data_path)
 
-    data_path.write_text(text, encoding="utf-8")
     new_meta = {
         "url": url,
         "etag": r.headers.get("ETag"),
         "last_modified": r.headers.get("Last-Modified"),
     }
-    meta_path.write_text(json.dumps(new_meta, indent=2), encoding="utf-8")
+    meta_path.write_bytes(_json_dumps(new_meta))
 
-    return text
+
+def fetch_and_cache(url: str, user: str, password: str) -> str:
+    """
+    Returns the item text (VCF/ICS), using cache when possible.
+    """
+    r, meta, data_path, meta_path = _conditional_get(url, user, password)
+    with r:
+        if r.status_code != 304 or not data_path.exists():
+            _store(url, r, data_path, meta_path)
+
+    return data_path.read_text(encoding="utf-8", errors="replace")
+
+
+# url -> (etag, parsed vobject), so a 304 skips both the disk read and the parser.
+# Bounded LRU, safe to use from several threads.
+_PARSED_MAX = 2048
+_PARSED: OrderedDict[str, tuple[str, object]] = OrderedDict()
+_PARSED_LOCK = threading.Lock()
 
 
 def vobject_from_url(url: str, user: str, password: str):
-    text = fetch_and_cache(url, user, password)
-    # vobject.readOne handles VCARD and VCALENDAR
-    return vobject.readOne(text)
+    import vobject
+
+    r, meta, data_path, meta_path = _conditional_get(url, user, password)
+    with r:
+        # Servers that ignore If-None-Match still send the same ETag for an
+        # unchanged item
+        etag = meta.get("etag") if r.status_code == 304 else r.headers.get("ETag")
+        if etag:
+            with _PARSED_LOCK:
+                hit = _PARSED.get(url)
+                if hit and hit[0] == etag:
+                    _PARSED.move_to_end(url)
+                    return hit[1]
+
+        if r.status_code != 304 or not data_path.exists():
+            _store(url, r, data_path, meta_path)
+            etag = r.headers.get("ETag")
+
+    # vobject.readOne handles VCARD and VCALENDAR, and parses straight from the file
+    with data_path.open(encoding="utf-8", errors="replace") as f:
+        v = vobject.readOne(f)
+    if etag:
+        with _PARSED_LOCK:
+            _PARSED[url] = (etag, v)
+            _PARSED.move_to_end(url)
+            if len(_PARSED) > _PARSED_MAX:
+                _PARSED.popitem(last=False)
+    return v
 
 
 # ----------------------------
 # Finder helpers (by title/name)
 # ----------------------------
-def find_caldav_item_by_title(items, wanted: str):
-    for item in items:
-        v = item.vobject_instance
-        name = extract_display_name(v) or ""
-        if name == wanted:
-            return item
+def _title_index_path(mgr) -> Path:
+    h = _cache_key(mgr.base)
+    return cache_dir() / f"titles-{h}.json"
+
+
+def _collection_sync_token(mgr):
+    """
+    Depth: 0 PROPFIND for the collection's sync-token (or CTag as a fallback).
+    Either changes whenever an item of the collection does. None if unavailable.
+    """
+    body = """<?xml version="1.0" encoding="utf-8" ?>
+<d:propfind xmlns:d="DAV:" xmlns:cs="http://calendarserver.org/ns/">
+  <d:prop><d:sync-token/><cs:getctag/></d:prop>
+</d:propfind>
+"""
+    try:
+        r = _http().request(
+            "PROPFIND",
+            mgr.base,
+            auth=mgr.auth,
+            headers={"Depth": "0", "Content-Type": "application/xml"},
+            data=body,
+            timeout=15,
+        )
+        r.raise_for_status()
+        root = ET.fromstring(r.content)
+    except Exception:
+        return None
+
+    for tag in ("{DAV:}sync-token", "{http://calendarserver.org/ns/}getctag"):
+        el = root.find(f".//{tag}")
+        if el is not None and el.text:
+            return el.text.strip()
     return None
 
 
+def find_caldav_item_by_title(mgr, wanted: str):
+    """
+    Find an item of `mgr`'s collection by its display name.
+
+    A {title: href} index is kept on disk along with the collection's sync-token:
+    while the token is unchanged, a hit costs one GET instead of listing and
+    parsing the whole collection. Misses and stale indexes fall back to mgr.list()
+    and refresh the index.
+    """
+    index_path = _title_index_path(mgr)
+    index = load_cached(index_path)
+    token = _collection_sync_token(mgr)
+
+    href = index.get("titles", {}).get(wanted)
+    if token and href and index.get("sync_token") == token:
+        try:
+            return CalendarObjectResource(
+                client=mgr.client, url=href, parent=mgr.calendar
+            ).load()
+        except Exception:
+            pass
+
+    found = None
+    titles: dict[str, str] = {}
+    for item in mgr.list():
+        v = _cached_vobject(item)
+        name = extract_display_name(v) or ""
+        titles.setdefault(name, str(item.url))
+        if found is None and name == wanted:
+            found = item
+
+    if token:
+        index_path.write_bytes(_json_dumps({"sync_token": token, "titles": titles}))
+    return found
+
+
+_ANGLE_EMAIL_RE = re.compile(r"^\s*(.*?)\s*<\s*([^>]+)\s*>\s*$")
+
+
 def _strip_angle_email(s: str):
     """
     "Manon <a@b.com>" -> ("Manon", "a@b.com")
     "Manon" -> ("Manon", None)
     """
-    m = re.match(r"^\s*(.*?)\s*<\s*([^>]+)\s*>\s*$", s)
+    # Plain names (the common case) never reach the regex engine
+    m = _ANGLE_EMAIL_RE.match(s) if "<" in s else None
     if not m:
         return s.strip(), None
     return m.group(1).strip(), m.group(2).strip()
@@ -228,28 +585,42 @@ def _first_value(v, key: str):
         return None
 
 
-def find_contact_url_by_name(cm, wanted: str):
-    wanted_name, wanted_email = _strip_angle_email(wanted)
+def _contact_index_path(cm) -> Path:
+    return cache_dir() / f"contacts-{_cache_key(cm.base)}.json"
+
+
+def _load_or_build_contact_index(cm) -> dict[str, list[list[str]]]:
+    """
+    {FN: [[url, lowercased email], ...]} of the whole addressbook.
+
+    Kept on disk along with the collection's sync-token: while the token is
+    unchanged, no vCard is downloaded. Otherwise it is rebuilt from a single
+    addressbook-query REPORT.
+    """
+    index_path = _contact_index_path(cm)
+    index = load_cached(index_path)
+    token = _collection_sync_token(cm)
+    if token and index.get("sync_token") == token:
+        return index["names"]
+
+    names: dict[str, list[list[str]]] = {}
+    for contact in cm.list_bulk():
+        names.setdefault(contact.name.strip(), []).append(
+            [contact.url, contact.email.strip().lower()]
+        )
+
+    if token:
+        index_path.write_bytes(_json_dumps({"sync_token": token, "names": names}))
+    return names
 
-    for url in cm.list():
-        try:
-            v = cm.get(url)
-        except Exception:
-            continue
 
-        fn = (getattr(v, "fn", None).value if hasattr(v, "fn") else "") or ""
-        email = _first_value(v, "email") or ""
+def find_contact_url_by_name(cm, wanted: str):
+    wanted_name, wanted_email = _strip_angle_email(wanted)
 
+    for url, email in _load_or_build_contact_index(cm).get(wanted_name, ()):
         # Match by "Nom <email>" if provided, otherwise by FN only
-        if wanted_email:
-            if (
-                fn.strip() == wanted_name
-                and email.strip().lower() == wanted_email.lower()
-            ):
-                return url
-        else:
-            if fn.strip() == wanted_name:
-                return url
+        if not wanted_email or email == wanted_email.lower():
+            return url
 
     return None
 
@@ -257,18 +628,100 @@ def find_contact_url_by_name(cm, wanted: str):
 # ----------------------------
 # Manager selection
 # ----------------------------
-def get_manager(kind: str, *, cal_url: str, addr_url: str, user: str, password: str):
-    if kind == "event":
-        return CalendarManager(
-            cal_url, user, password, google_service=get_google_service()
-        )
-    if kind == "task":
-        return TaskManager(cal_url, user, password)
-    if kind == "journal":
-        return JournalManager(cal_url, user, password)
-    if kind == "contact":
-        return ContactManager(addr_url, user, password)
-    raise ValueError(f"Unknown kind: {kind}")
+class CachedListManager:
+    """
+    Thin proxy around a Manager that memoizes list() per arguments, so repeated
+    lookups in one process don't re-issue the REPORT.
+    Any mutating call drops the cached listing.
+    """
+
+    _MUTATORS = frozenset({"add", "update", "delete", "complete", "invite"})
+
+    def __init__(self, mgr):
+        self._mgr = mgr
+        self._cached_list = functools.lru_cache(maxsize=8)(self._list)
+
+    def _list(self, args, kwargs):
+        return self._mgr.list(*args, **dict(kwargs))
+
+    def list(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable arguments (e.g. a list of categories): just don't memoize
+            return self._mgr.list(*args, **kwargs)
+        return self._cached_list(*key)
+
+    def invalidate(self):
+        self._cached_list.cache_clear()
+        _VOBJECT_CACHE.clear()
+
+    def __getattr__(self, name):
+        attr = getattr(self._mgr, name)
+        if name not in self._MUTATORS:
+            return attr
+
+        @functools.wraps(attr)
+        def mutate(*args, **kwargs):
+            self.invalidate()
+            return attr(*args, **kwargs)
+
+        return mutate
+
+
+def _event_manager(user, password, cal_url, addr_url):
+    from managers.calendar_manager import CalendarManager
+
+    # The Google service (and its OAuth token) is only resolved once invites need it
+    return CalendarManager(
+        cal_url, user, password, google_service_factory=get_google_service
+    )
+
+
+def _task_manager(user, password, cal_url, addr_url):
+    from managers.task_manager import TaskManager
+
+    return TaskManager(cal_url, user, password)
+
+
+def _journal_manager(user, password, cal_url, addr_url):
+    from managers.journal_manager import JournalManager
+
+    return JournalManager(cal_url, user, password)
+
+
+def _contact_manager(user, password, cal_url, addr_url):
+    from managers.contact_manager import ContactManager
+
+    return ContactManager(addr_url, user, password)
+
+
+# Each factory only imports the manager module its kind needs.
+_MANAGER_FACTORIES = {
+    "event": _event_manager,
+    "task": _task_manager,
+    "journal": _journal_manager,
+    "contact": _contact_manager,
+}
+
+
+def get_manager(
+    kind: str,
+    *,
+    user: str,
+    password: str,
+    cal_url: str | None = None,
+    addr_url: str | None = None,
+):
+    """
+    Build the manager for `kind`: events/tasks/journals need `cal_url`, contacts `addr_url`.
+    """
+    try:
+        factory = _MANAGER_FACTORIES[kind]
+    except KeyError:
+        raise ValueError(f"Unknown kind: {kind}") from None
+    return CachedListManager(factory(user, password, cal_url, addr_url))
 
 
 def vcard_values(v, key: str):
@@ -289,34 +742,67 @@ def vcard_values(v, key: str):
     return out
 
 
-def format_contact_extra(v):
-    emails = vcard_values(v, "email")
-    tels = vcard_values(v, "tel")
-    adrs = vcard_values(v, "adr")
+_EXTRA_SOCIALS = ("instagram", "linkedin", "github")
+
 
-    insta = vcard_social(v, "instagram")
-    linkedin = vcard_social(v, "linkedin")
-    github = vcard_social(v, "github")
+def _first_line_value(lines):
+    for line in lines:
+        try:
+            return line.value
+        except Exception:
+            # some vobject lines can be weird; ignore silently
+            continue
+    return None
+
+
+def _extract_contact_fields(v) -> dict:
+    """
+    First email/tel/adr of a vCard and its first instagram/linkedin/github
+    X-SOCIALPROFILE url, in one pass over v.contents (missing ones are None).
+    """
+    fields = dict.fromkeys(("email", "tel", "adr") + _EXTRA_SOCIALS)
+    if v is None:
+        return fields
+    c = v.contents
+    for key in ("email", "tel", "adr"):
+        fields[key] = _first_line_value(c.get(key, ()))
+
+    missing = set(_EXTRA_SOCIALS)
+    for line in c.get("x-socialprofile", ()):
+        if not missing:
+            break
+        try:
+            types = {t.lower() for t in line.params.get("TYPE", ())}
+            for social_type in missing & types:
+                fields[social_type] = line.value
+                missing.discard(social_type)
+        except Exception:
+            continue
+    return fields
+
+
+def format_contact_extra(v):
+    fields = _extract_contact_fields(v)
 
     parts = []
 
-    if emails:
-        parts.append(f"<{emails[0]}>")
+    if fields["email"] is not None:
+        parts.append(f"<{fields['email']}>")
 
-    if insta:
-        parts.append(f"ig:{insta}")
+    if fields["instagram"]:
+        parts.append(f"ig:{fields['instagram']}")
 
-    if linkedin:
+    if fields["linkedin"]:
         parts.append("li")
 
-    if github:
+    if fields["github"]:
         parts.append("gh")
 
-    if tels:
-        parts.append(f"tel:{tels[0]}")
+    if fields["tel"] is not None:
+        parts.append(f"tel:{fields['tel']}")
 
-    if adrs:
-        adr = adrs[0]
+    adr = fields["adr"]
+    if adr is not None:
         try:
             adr_parts = [adr.street, adr.city, adr.code, adr.country]
             adr_str = ", ".join([p for p in adr_parts if p])